@@ -1,60 +1,146 @@
 # -*- coding: utf-8 -*-
 """Command to install a basis set."""
 import pathlib
-import tempfile
+import typing
 
 import click
-import requests
-from tqdm import tqdm
 from aiida.cmdline.params import options as options_core
-from aiida.cmdline.params import types
 from aiida.cmdline.utils import decorators, echo
-from aiida.orm import Group, QueryBuilder
 from aiida_basis import __version__
-from aiida_basis.groups.set.openmx import OpenmxBasisSet, OpenmxConfiguration
 
 from .params import options
+from .params.types import PathOrUrl
 from .root import cmd_root
-from .utils import (attempt, create_basis_set_from_archive, create_basis_set_from_directory)
+from .utils import (
+    COPY_BUFFER_SIZE, attempt, create_basis_set_from_archive, create_basis_set_from_directory, get_session
+)
 
+if typing.TYPE_CHECKING:
+    from aiida_basis.groups.set.openmx import OpenmxConfiguration
 
-def download_openmx(configuration: OpenmxConfiguration, dirpath: pathlib.Path, traceback: bool = False) -> None:
+
+def _get_pao_subdirectory(element: str, element_metadata: dict) -> str:
+    """Return the subdirectory of the element directory on the OpenMX website in which its PAO file is hosted.
+
+    :param element: the element symbol.
+    :param element_metadata: the metadata of the element in the configuration.
+    :return: the subdirectory including a trailing slash, or an empty string if the file is in the element directory.
+    """
+    if element_metadata.get('hardness') == 'hard':
+        return f'{element}_Hard/'
+    if element_metadata.get('hardness') == 'soft':
+        return f'{element}_Soft/'
+    if element_metadata.get('open_core') is True:
+        return f'{element}_OC/'
+    if element_metadata.get('open_core') is False:
+        return f'{element}/'
+    return ''
+
+
+def _download_file(url: str, filepath: pathlib.Path) -> pathlib.Path:
+    """Download the content of a URL to a file on disk.
+
+    :param url: the URL to download.
+    :param filepath: absolute filepath to which to write the content.
+    :return: the filepath.
+    :raises requests.HTTPError: if the request was not successful.
+    """
+    import shutil
+
+    with get_session().get(url, stream=True) as response:
+        response.raise_for_status()
+        # Undo any transfer encoding such as gzip, since the raw stream is copied directly to the file.
+        response.raw.decode_content = True
+        with open(filepath, 'wb') as stream:
+            shutil.copyfileobj(response.raw, stream, length=COPY_BUFFER_SIZE)
+
+    return filepath
+
+
+def _is_downloaded(filepath: pathlib.Path, md5: str) -> bool:
+    """Return whether the file exists on disk with the given md5 checksum.
+
+    :param filepath: absolute filepath of the file.
+    :param md5: the expected md5 checksum of the file.
+    :return: True if the file exists and its md5 checksum matches, False otherwise.
+    """
+    from aiida_basis.data.basis.basis import md5_from_filelike
+
+    if not filepath.is_file():
+        return False
+
+    with open(filepath, 'rb') as handle:
+        return md5_from_filelike(handle) == md5
+
+
+def prune_download_cache(dirpath: pathlib.Path, filenames: typing.Collection[str]) -> None:
+    """Remove the files from a download cache directory that are not among the given filenames.
+
+    Only regular files are removed, any other entries, such as directories, are left untouched.
+
+    :param dirpath: absolute dirpath of the cache directory.
+    :param filenames: the filenames of the files that should be kept.
+    """
+    for filepath in dirpath.iterdir():
+        if filepath.name not in filenames and filepath.is_file() and not filepath.is_symlink():
+            filepath.unlink()
+
+
+def get_download_cache_dirpath(configuration: 'OpenmxConfiguration') -> pathlib.Path:
+    """Return the directory in which the PAO files of an OpenMX configuration are cached between invocations.
+
+    :param configuration: the OpenMX configuration.
+    :return: absolute dirpath of the cache directory, which is located in the AiiDA configuration directory.
+    """
+    from aiida.manage.configuration import get_config
+
+    dirname = f'{configuration.version}_{configuration.protocol}_{configuration.hardness}'
+    return pathlib.Path(get_config().dirpath) / 'cache' / 'aiida-basis' / 'openmx' / dirname
+
+
+def download_openmx(
+    configuration: 'OpenmxConfiguration',
+    dirpath: pathlib.Path,
+    metadata: dict,
+    traceback: bool = False,
+    max_workers: int = 8
+) -> None:
     """Download the PAO files for an OpenMX configuration to a directory on disk.
 
+    The files are independent, so they are downloaded concurrently by a pool of threads. Files that already exist in
+    the directory with the md5 checksum defined in the metadata are not downloaded again. Any other files in the
+    directory are left untouched.
+
     :param configuration: the OpenMX configuration to download.
     :param dirpath: absolute dirpath to the directory in which to download the PAO files.
+    :param metadata: the metadata of the configuration, as returned by ``OpenmxBasisSet.get_configuration_metadata``.
     :param traceback: boolean, if true, print the traceback if an exception occurs.
+    :param max_workers: the maximum number of files that are downloaded concurrently.
     """
-    # pylint: disable=too-many-locals
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from tqdm import tqdm
+    from aiida_basis.groups.set.openmx import OpenmxBasisSet
 
-    url_base = 'https://t-ozaki.issp.u-tokyo.ac.jp/'
-    url_version = {'19': 'vps_pao2019/', '13': 'vps_pao2013/'}
+    url_prefix = f'{OpenmxBasisSet.url_base}/{OpenmxBasisSet.url_version[configuration.version]}'
 
-    metadata = OpenmxBasisSet.get_configuration_metadata(configuration)
+    pending = {
+        element: values
+        for element, values in metadata.items()
+        if not _is_downloaded(dirpath / values['filename'], values['md5'])
+    }
 
     with attempt('downloading selected PAO basis set files... ', include_traceback=traceback):
-        pbar = tqdm(metadata.items(), desc='Downloading')
-        for element, element_metadata in pbar:
-            pbar.set_description(f'Downloading {element_metadata["filename"]}')
-
-            url_element = f'{url_base}/{url_version[configuration.version]}/{element}/'
-
-            if element_metadata.get('hardness') == 'hard':
-                url = url_element + f'{element}_Hard/{element_metadata["filename"]}'
-            elif element_metadata.get('hardness') == 'soft':
-                url = url_element + f'{element}_Soft/{element_metadata["filename"]}'
-            elif element_metadata.get('open_core') is True:
-                url = url_element + f'{element}_OC/{element_metadata["filename"]}'
-            elif element_metadata.get('open_core') is False:
-                url = url_element + f'{element}/{element_metadata["filename"]}'
-            else:
-                url = url_element + f'{element_metadata["filename"]}'
-
-            response = requests.get(url)
-            response.raise_for_status()
-            with open(dirpath / element_metadata['filename'], 'wb') as stream:
-                stream.write(response.content)
-                stream.flush()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _download_file,
+                    f'{url_prefix}/{element}/{_get_pao_subdirectory(element, values)}{values["filename"]}',
+                    dirpath / values['filename'],
+                ) for element, values in pending.items()
+            ]
+            pbar = tqdm(as_completed(futures), total=len(futures), desc='Downloading')
+            for future in pbar:
+                pbar.set_description(f'Downloaded {future.result().name}')
 
 
 @cmd_root.group('install')
@@ -63,7 +149,7 @@ def cmd_install():
 
 
 @cmd_install.command('basisset')
-@click.argument('archive', type=types.FileOrUrl(mode='rb'))
+@click.argument('archive', type=PathOrUrl(exists=True, file_okay=True))
 @click.argument('label', type=click.STRING)
 @options_core.DESCRIPTION(help='Description for the basis set.')
 @options.ARCHIVE_FORMAT()
@@ -72,7 +158,15 @@ def cmd_install():
 @options.TRACEBACK()
 @decorators.with_dbenv()
 def cmd_install_basis_set(archive, label, description, archive_format, basis_set_type, basis_type, traceback):  # pylint: disable=too-many-arguments
-    """Install a standard basis set from an ARCHIVE."""
+    """Install a standard basis set from an ARCHIVE.
+
+    If a basis set with the same LABEL was already installed from an identical archive, that basis set is reused and
+    left unchanged.
+    """
+    from aiida.orm import QueryBuilder
+
+    existing = QueryBuilder().append(basis_set_type, filters={'label': label}, project='id').first()
+
     if isinstance(archive, pathlib.Path) and archive.is_dir():
         with attempt(f'creating a basis_set from directory `{archive}`...', include_traceback=traceback):
             basis_set = basis_set_type.create_from_folder(archive, label, basis_type=basis_type)
@@ -83,24 +177,32 @@ def cmd_install_basis_set(archive, label, description, archive_format, basis_set
             )
     else:
         # At this point, we can assume that it is not a valid filepath on disk, but rather a URL and the ``archive``
-        # variable will contain the result objects from the ``requests`` library. The validation of the URL will already
-        # have been done by the ``PathOrUrl`` parameter type, so the URL is reachable. The content of the URL must be
-        # copied to a local temporary file because `create_basis_set_from_archive` does currently not accept filelike
-        # objects, because in turn the underlying `shutil.unpack_archive` does not. In addition, `unpack_archive` will
-        # attempt to deduce the archive format from the filename extension, so it is important we maintain the original
-        # filename. Of course if this fails, users can specify the archive format explicitly with the corresponding
-        # option. We get the filename by converting the URL to a ``Path`` object and taking the filename, using that as
-        # a suffix for the temporary file that is generated on disk to copy the content to.
-        suffix = pathlib.Path(archive.url).name
-        with tempfile.NamedTemporaryFile(mode='w+b', suffix=suffix) as handle:
-            handle.write(archive.content)
-            handle.flush()
+        # variable will contain the response object from the ``requests`` library, whose body has not yet been read.
+        # The validation of the URL will already have been done by the ``PathOrUrl`` parameter type, so the URL is
+        # reachable. The content is streamed into an anonymous temporary file. This is a real file object, unlike a
+        # ``SpooledTemporaryFile``, which before Python 3.11 lacks methods such as ``seekable`` and ``readinto`` that
+        # ``zipfile`` and ``libarchive`` require. Since the temporary file has no name with an extension, the format of
+        # the archive is determined from its content instead. If this fails, users can specify the archive format
+        # explicitly with the corresponding option.
+        import shutil
+        import tempfile
+
+        with tempfile.TemporaryFile(mode='w+b') as handle:
+            # Closing the response releases its connection back to the pool of the session.
+            with archive:
+                archive.raw.decode_content = True
+                shutil.copyfileobj(archive.raw, handle, length=COPY_BUFFER_SIZE)
+            handle.seek(0)
 
             with attempt('unpacking archive and parsing basis... ', include_traceback=traceback):
                 basis_set = create_basis_set_from_archive(
-                    basis_set_type, label, pathlib.Path(handle.name), fmt=archive_format, basis_type=basis_type
+                    basis_set_type, label, handle, fmt=archive_format, basis_type=basis_type
                 )
 
+    if existing and basis_set.pk == existing[0]:
+        echo.echo_warning(f'`{label}` was already installed from an identical archive, reusing the existing basis set')
+        return
+
     basis_set.description = description
     echo.echo_success(f'installed `{label}` containing {basis_set.count()} bases')
 
@@ -109,15 +211,23 @@ def cmd_install_basis_set(archive, label, description, archive_format, basis_set
 @options.VERSION(type=click.Choice(['19']), default='19', show_default=True)
 @options.PROTOCOL(type=click.Choice(['quick', 'standard', 'precise']), default='standard', show_default=True)
 @options.HARDNESS(type=click.Choice(['soft', 'hard']), default='soft', show_default=True)
+@options.CACHE()
 @options.TRACEBACK()
 @decorators.with_dbenv()
-def cmd_install_openmx(version, protocol, hardness, traceback):
+def cmd_install_openmx(version, protocol, hardness, cache, traceback):  # pylint: disable=too-many-arguments
     """Install an OpenMX configuration.
 
     The OpenMX configuration will be automatically downloaded from t-ozaki.issp.u-tokyo.ac.jp to create a new
-    `OpenmxBasisSet`.
+    `OpenmxBasisSet`. Unless caching is disabled, the downloaded files are kept in the AiiDA configuration directory,
+    such that they do not have to be downloaded again if the installation is interrupted or repeated.
     """
     # pylint: disable=too-many-locals
+    import contextlib
+    import tempfile
+
+    from aiida.orm import Group, QueryBuilder
+    from aiida_basis.groups.set.openmx import OpenmxBasisSet, OpenmxConfiguration
+
     configuration = OpenmxConfiguration(version, protocol, hardness)
 
     if configuration not in OpenmxBasisSet.valid_configurations:
@@ -130,22 +240,31 @@ def cmd_install_openmx(version, protocol, hardness, traceback):
     if QueryBuilder().append(OpenmxBasisSet, filters={'label': label}).first():
         echo.echo_critical(f'{OpenmxBasisSet.__name__}<{label}> is already installed')
 
-    with tempfile.TemporaryDirectory() as dirpath:
-        dirpath = pathlib.Path(dirpath)
-        download_openmx(configuration, dirpath)
+    with contextlib.ExitStack() as stack:
+
+        if cache:
+            dirpath = get_download_cache_dirpath(configuration)
+            dirpath.mkdir(parents=True, exist_ok=True)
+            # Remove files that are not part of the configuration, such that they are not parsed into the basis set.
+            prune_download_cache(dirpath, {values['filename'] for values in metadata.values()})
+        else:
+            dirpath = pathlib.Path(stack.enter_context(tempfile.TemporaryDirectory()))
+
+        download_openmx(configuration, dirpath, metadata, traceback=traceback)
 
         with attempt('parsing PAOs... ', include_traceback=traceback):
             basis_set = create_basis_set_from_directory(OpenmxBasisSet, label, dirpath)
 
-        orbital_configurations = {}
+        # The bases that were just added are cached on the basis set, so this does not require querying the database.
+        md5s = {element: basis.md5 for element, basis in basis_set.bases.items()}
 
         for element, values in metadata.items():
-            if basis_set.get_basis(element).md5 != values['md5']:
+            if md5s.get(element) != values['md5']:
                 Group.objects.delete(basis_set.pk)
                 msg = f'md5 of PAO for element {element} does not match that of the metadata {values["md5"]}'
                 echo.echo_critical(msg)
 
-            orbital_configurations[element] = metadata[element]['orbital_configuration']
+        orbital_configurations = {element: values['orbital_configuration'] for element, values in metadata.items()}
 
         basis_set.description = description
         basis_set.set_orbital_configurations(orbital_configurations)
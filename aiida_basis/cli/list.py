@@ -11,19 +11,35 @@ PROJECTIONS_VALID = ('pk', 'uuid', 'type_string', 'label', 'description', 'count
 PROJECTIONS_DEFAULT = ('label', 'type_string', 'count')
 
 
-def get_basis_sets_builder():
+def get_basis_sets_builder(project=None, type_string=None):
     """Return a query builder that will query for instances of `BasisSet` or its subclasses.
 
+    :param project: optional list of properties of the `BasisSet` to project, by default the instance is returned.
+    :param type_string: optional type string to which the query should be restricted.
     :return: `QueryBuilder` instance
     """
     from aiida.orm import QueryBuilder
     from aiida_basis.groups.set import BasisSet
 
-    builder = QueryBuilder().append(BasisSet)
+    filters = {'type_string': type_string} if type_string is not None else None
+    builder = QueryBuilder().append(BasisSet, filters=filters, project=project)
 
     return builder
 
 
+def get_basis_set_count(pk):
+    """Return the number of nodes contained in the basis set with the given pk.
+
+    :param pk: the pk of the basis set.
+    :return: the number of nodes in the basis set.
+    """
+    from aiida.orm import Group, Node, QueryBuilder
+
+    builder = QueryBuilder().append(Group, filters={'id': pk}, tag='group').append(Node, with_group='group')
+
+    return builder.count()
+
+
 @cmd_root.command('list')
 @options_core.PROJECT(type=click.Choice(PROJECTIONS_VALID), default=PROJECTIONS_DEFAULT)
 @options_core.RAW()
@@ -34,28 +50,30 @@ def cmd_list(project, raw, basis_set_type):
     from tabulate import tabulate
 
     mapping_project = {
-        'count': lambda family: family.count(),
+        'pk': 'id',
     }
 
     if get_basis_sets_builder().count() == 0:
         echo.echo_info('no basis sets have been installed yet: use `aiida-basis install`.')
         return
 
-    rows = []
-
-    for group, in get_basis_sets_builder().iterall():
+    # Only the columns that are requested are queried for instead of loading the entire ``BasisSet`` instances. The
+    # ``id`` is always projected, since it is needed to determine the number of nodes if ``count`` is requested.
+    columns = [mapping_project.get(projection, projection) for projection in project if projection != 'count']
+    type_string = basis_set_type.get_entry_point_name() if basis_set_type else None
+    builder = get_basis_sets_builder(project=['id'] + columns, type_string=type_string)
 
-        if basis_set_type and basis_set_type.entry_point != group.type_string:
-            continue
+    rows = []
 
+    for pk, *values in builder.iterall(batch_size=100):
+        projected = dict(zip(columns, values))
         row = []
 
         for projection in project:
-            try:
-                projected = mapping_project[projection](group)
-            except KeyError:
-                projected = getattr(group, projection)
-            row.append(projected)
+            if projection == 'count':
+                row.append(get_basis_set_count(pk))
+            else:
+                row.append(projected[mapping_project.get(projection, projection)])
 
         rows.append(row)
 
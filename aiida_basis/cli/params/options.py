@@ -1,13 +1,11 @@
 # -*- coding: utf-8 -*-
 """Reusable options for CLI commands."""
-import shutil
-
 import click
 
 from aiida.cmdline.params.options import OverridableOption
-from .types import BasisSetTypeParam, BasisTypeParam
+from .types import ArchiveFormatChoice, BasisSetTypeParam, BasisTypeParam
 
-__all__ = ('VERSION', 'PROTOCOL', 'TRACEBACK', 'BASIS_SET_TYPE', 'ARCHIVE_FORMAT')
+__all__ = ('VERSION', 'PROTOCOL', 'CACHE', 'TRACEBACK', 'PRETTY', 'BASIS_SET_TYPE', 'ARCHIVE_FORMAT')
 
 VERSION = OverridableOption(
     '-v', '--version', type=click.STRING, required=False, help='Select the version of the installed configuration.'
@@ -21,10 +19,21 @@ HARDNESS = OverridableOption(
     '-h', '--hardness', type=click.STRING, required=False, help='Select the hardness of the installed configuration.'
 )
 
+CACHE = OverridableOption(
+    '--cache/--no-cache',
+    default=True,
+    show_default=True,
+    help='Keep downloaded files in the AiiDA configuration directory and reuse them on subsequent invocations.'
+)
+
 TRACEBACK = OverridableOption(
     '-t', '--traceback', is_flag=True, help='Include the stacktrace if an exception is encountered.'
 )
 
+PRETTY = OverridableOption(
+    '--pretty', is_flag=True, help='Format tables with `tabulate`, which pads headers and right-aligns numeric columns.'
+)
+
 BASIS_SET_TYPE = OverridableOption(
     '-T',
     '--basis-set-type',
@@ -43,6 +52,4 @@ BASIS_TYPE = OverridableOption(
     help='Choose the type of basis to use.'
 )
 
-ARCHIVE_FORMAT = OverridableOption(
-    '-F', '--archive-format', type=click.Choice([fmt[0] for fmt in shutil.get_archive_formats()])
-)
+ARCHIVE_FORMAT = OverridableOption('-F', '--archive-format', type=ArchiveFormatChoice())
@@ -1,20 +1,106 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=no-self-use
 """Custom parameter types for command line interface commands."""
+import functools
 import typing
 import pathlib
 
 import click
-import requests
 
 from aiida.cmdline.params.types import GroupParamType
-from ..utils import attempt
+from ..utils import attempt, get_session
 
-__all__ = ('BasisSetTypeParam', 'BasisTypeParam')
+__all__ = ('ArchiveFormatChoice', 'BasisSetParam', 'BasisSetTypeParam', 'BasisTypeParam', 'PathOrUrl')
 
 
-class BasisTypeParam(GroupParamType):
-    """Parameter type for `click` commands to define an instance of a `BasisSet`."""
+@functools.lru_cache(maxsize=None)
+def get_entry_point_names(group: str) -> typing.List[str]:
+    """Return the names of the entry points registered in the given entry point group.
+
+    .. note:: the registered entry points do not change during the lifetime of the process, so the result is cached.
+
+    :param group: the entry point group, e.g. ``aiida.groups``.
+    :return: list of entry point names.
+    """
+    from aiida.plugins.entry_point import get_entry_point_names as _get_entry_point_names
+    return _get_entry_point_names(group)
+
+
+@functools.lru_cache(maxsize=32)
+def load_basis_type(value: str):
+    """Load the ``BasisData`` subclass that corresponds to the given entry point name.
+
+    :param value: entry point name that should correspond to subclass of `Basis` data plugin
+    :return: the `Basis` subclass
+    :raises: `click.BadParameter` if the entry point cannot be loaded or is not subclass of `Basis`
+    """
+    from aiida.common import exceptions
+    from aiida.plugins import DataFactory
+    from aiida_basis.data.basis import BasisData
+
+    try:
+        basis_type = DataFactory(value)
+    except exceptions.EntryPointError as exception:
+        raise click.BadParameter(f'`{value}` is not an existing data plugin.') from exception
+
+    if not issubclass(basis_type, BasisData):
+        raise click.BadParameter(f'`{value}` entry point is not a subclass of `BasisData`.')
+
+    return basis_type
+
+
+@functools.lru_cache(maxsize=32)
+def load_basis_set_type(value: str):
+    """Load the ``BasisSet`` subclass that corresponds to the given entry point name.
+
+    :param value: entry point name that should correspond to subclass of `BasisSet` group plugin
+    :return: the `BasisSet` subclass
+    :raises: `click.BadParameter` if the entry point cannot be loaded or is not subclass of `BasisSet`
+    """
+    from aiida.common import exceptions
+    from aiida.plugins import GroupFactory
+    from aiida_basis.groups.set import BasisSet
+
+    try:
+        basis_set_type = GroupFactory(value)
+    except exceptions.EntryPointError as exception:
+        raise click.BadParameter(f'`{value}` is not an existing group plugin.') from exception
+
+    if not issubclass(basis_set_type, BasisSet):
+        raise click.BadParameter(f'`{value}` entry point is not a subclass of `BasisSet`.')
+
+    return basis_set_type
+
+
+class ArchiveFormatChoice(click.Choice):
+    """Choice of the archive formats that are supported by ``shutil``.
+
+    The supported formats are only determined when the choices are first accessed, instead of when the option is
+    defined, such that this is not done for every invocation of the command line interface.
+    """
+
+    def __init__(self, case_sensitive=True):
+        """Construct the choice without resolving the supported archive formats."""
+        self._choices = None
+        super().__init__([], case_sensitive=case_sensitive)
+
+    @property
+    def choices(self):
+        """Return the names of the archive formats that are supported by ``shutil``."""
+        if not self._choices:
+            import shutil
+            self._choices = [fmt[0] for fmt in shutil.get_archive_formats()]
+
+        return self._choices
+
+    @choices.setter
+    def choices(self, value):
+        """Set the choices explicitly."""
+        self._choices = value
+
+
+class BasisTypeParam(click.ParamType):
+    """Parameter type for `click` commands to define a subclass of `BasisData`."""
 
     name = 'basis_type'
 
@@ -25,28 +111,13 @@ class BasisTypeParam(GroupParamType):
         :return: the `Basis` subclass
         :raises: `click.BadParameter` if the entry point cannot be loaded or is not subclass of `Basis`
         """
-        from aiida.common import exceptions
-        from aiida.plugins import DataFactory
-        from aiida_basis.data.basis import BasisData
-
-        try:
-            basis_type = DataFactory(value)
-        except exceptions.EntryPointError as exception:
-            raise click.BadParameter(f'`{value}` is not an existing data plugin.') from exception
-
-        if not issubclass(basis_type, BasisData):
-            raise click.BadParameter(f'`{value}` entry point is not a subclass of `BasisData`.')
-
-        BasisData.entry_point = value
-
-        return basis_type
+        return load_basis_type(value)
 
     def complete(self, _, incomplete):
         """Return possible completions based on an incomplete value.
 
         :returns: list of tuples of valid entry points (matching incomplete) and a description
         """
-        from aiida.plugins.entry_point import get_entry_point_names
         entry_points = get_entry_point_names('aiida.data')
         return [(ep, '') for ep in entry_points if (ep.startswith('basis.basis') and ep.startswith(incomplete))]
 
@@ -63,28 +134,13 @@ class BasisSetTypeParam(click.ParamType):
         :return: the `BasisSet` subclass
         :raises: `click.BadParameter` if the entry point cannot be loaded or is not subclass of `BasisSet`
         """
-        from aiida.common import exceptions
-        from aiida.plugins import GroupFactory
-        from aiida_basis.groups.set import BasisSet
-
-        try:
-            basis_set_type = GroupFactory(value)
-        except exceptions.EntryPointError as exception:
-            raise click.BadParameter(f'`{value}` is not an existing group plugin.') from exception
-
-        if not issubclass(basis_set_type, BasisSet):
-            raise click.BadParameter(f'`{value}` entry point is not a subclass of `BasisSet`.')
-
-        BasisSet.entry_point = value
-
-        return basis_set_type
+        return load_basis_set_type(value)
 
     def complete(self, _, incomplete):
         """Return possible completions based on an incomplete value.
 
         :returns: list of tuples of valid entry points (matching incomplete) and a description
         """
-        from aiida.plugins.entry_point import get_entry_point_names
         entry_points = get_entry_point_names('aiida.groups')
         return [(ep, '') for ep in entry_points if (ep.startswith('basis.set') and ep.startswith(incomplete))]
 
@@ -100,12 +156,12 @@ class PathOrUrl(click.Path):
 
     name = 'PathOrUrl'
 
-    def convert(self, value, param, ctx) -> typing.Union[pathlib.Path, bytes]:  # pylint: disable=unsubscriptable-object
+    def convert(self, value, param, ctx) -> typing.Union[pathlib.Path, 'requests.Response']:  # pylint: disable=unsubscriptable-object
         """Convert the string value to the desired value.
 
         If the ``value`` corresponds to a valid path on the local filesystem, return it as a ``pathlib.Path`` instance.
-        Otherwise, treat it as a URL and try to fetch the content. If successful, the raw retrieved bytes will be
-        returned.
+        Otherwise, treat it as a URL and try to fetch the content. If successful, the ``requests.Response`` is returned
+        without its body having been read, such that the content can be streamed from its ``raw`` attribute.
 
         :param value: the filepath on the local filesystem or a URL.
         """
@@ -113,7 +169,13 @@ class PathOrUrl(click.Path):
             # Call the method of the super class, which will raise if it ``value`` is not a valid path.
             return pathlib.Path(super().convert(value, param, ctx))
         except click.exceptions.BadParameter:
+            import requests
+
             with attempt(f'attempting to download data from `{value}`...'):
-                response = requests.get(value)
-                response.raise_for_status()
+                response = get_session().get(value, stream=True)
+                try:
+                    response.raise_for_status()
+                except requests.HTTPError:
+                    response.close()
+                    raise
                 return response
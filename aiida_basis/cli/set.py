@@ -3,10 +3,9 @@
 from aiida.cmdline.params import options as options_core
 from aiida.cmdline.utils import decorators, echo
 
-from ..groups.mixins import RecommendedOrbitalConfigurationMixin
-from .params import arguments
+from .params import arguments, options
 from .root import cmd_root
-from .utils import format_orbital_configuration
+from .utils import format_orbital_configuration, format_table
 
 
 @cmd_root.group('set')
@@ -17,25 +16,40 @@ def cmd_basis_set():
 @cmd_basis_set.command('show')
 @arguments.BASIS_SET()
 @options_core.RAW()
+@options.PRETTY()
 @decorators.with_dbenv()
-def cmd_basis_set_show(basis_set, raw):
+def cmd_basis_set_show(basis_set, raw, pretty):
     """Show the details of a basis set."""
-    from tabulate import tabulate
+    from aiida.orm import QueryBuilder
+    from aiida_basis.data.basis import BasisData
+    from aiida_basis.groups.mixins import RecommendedOrbitalConfigurationMixin
+
+    builder = QueryBuilder()
+    builder.append(basis_set.__class__, filters={'id': basis_set.pk}, tag='basis_set')
+    builder.append(
+        BasisData,
+        with_group='basis_set',
+        project=['attributes.element', 'attributes.filename', 'attributes.md5'],
+        tag='basis'
+    )
+    builder.order_by({'basis': [{'attributes.element': {'order': 'asc', 'cast': 't'}}]})
+    rows = builder.iterall()
 
     if isinstance(basis_set, RecommendedOrbitalConfigurationMixin):
         headers = ['Element', 'Basis', 'MD5', 'Orbital configuration']
-        rows = [[
-            basis.element, basis.filename, basis.md5,
-            format_orbital_configuration(
-                basis_set.get_recommended_orbital_configurations(elements=basis.element)[basis.element]
-            )
-        ] for basis in basis_set.nodes]
-
+        orbital_configurations = basis_set.get_orbital_configurations()
+        rows = (list(row) + [format_orbital_configuration(orbital_configurations.get(row[0], []))] for row in rows)
     else:
         headers = ['Element', 'Basis', 'MD5']
-        rows = [[basis.element, basis.filename, basis.md5] for basis in basis_set.nodes]
 
-    if raw:
-        echo.echo(tabulate(sorted(rows), tablefmt='plain'))
+    if pretty:
+        from tabulate import tabulate
+
+        if raw:
+            echo.echo(tabulate(list(rows), tablefmt='plain'))
+        else:
+            echo.echo(tabulate(list(rows), headers=headers))
+    elif raw:
+        echo.echo(format_table(rows))
     else:
-        echo.echo(tabulate(sorted(rows), headers=headers))
+        echo.echo(format_table(rows, headers=headers))
@@ -4,7 +4,11 @@ from contextlib import contextmanager
 
 from aiida.cmdline.utils import echo
 
-__all__ = ('attempt', 'create_basis_set_from_directory', 'create_basis_set_from_archive')
+__all__ = ('attempt', 'get_session', 'create_basis_set_from_directory', 'create_basis_set_from_archive')
+
+COPY_BUFFER_SIZE = 64 * 1024  # Buffer size in bytes used when copying streamed downloads to disk
+
+_SESSION = None
 
 
 @contextmanager
@@ -31,6 +35,32 @@ def attempt(message, exception_types=Exception, include_traceback=False):
         echo.echo_highlight(' [OK]', color='success', bold=True)
 
 
+def get_session():
+    """Return the ``requests.Session`` that is shared by all commands that download data.
+
+    Reusing a single session allows connections to the same host to be kept alive and pooled, instead of performing a
+    new handshake for each request. The session is created, and its connection adapter mounted, only once per process,
+    such that the connection pool is never discarded. Failed requests are retried with an exponential backoff.
+
+    :return: the ``requests.Session`` instance.
+    """
+    global _SESSION  # pylint: disable=global-statement
+
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=retries)
+
+        _SESSION = requests.Session()
+        _SESSION.mount('https://', adapter)
+        _SESSION.mount('http://', adapter)
+
+    return _SESSION
+
+
 def create_basis_set_from_directory(cls, label, dirpath, basis_type=None):
     """Construct a new basis set instance from a directory.
 
@@ -53,36 +83,187 @@ def create_basis_set_from_directory(cls, label, dirpath, basis_type=None):
     return basis_set
 
 
+def iter_archive_files(archive, fmt=None):
+    """Iterate over the files contained in an archive, without unpacking it to disk.
+
+    Only the ``zip`` and tar based formats are supported. If the format is not specified, it is deduced from the
+    content. Tar archives are read as a stream, such that each member is read exactly once, in order. The files should
+    either all be at the top level of the archive or all be contained in a single directory.
+
+    .. note:: if the optional ``libarchive-c`` package is installed, it is used to read the archive instead of the
+        ``tarfile`` and ``zipfile`` modules of the standard library. The format is then always deduced from the content.
+
+    :param archive: absolute filepath of the archive, or a seekable binary filelike object with its content. The object
+        should implement the full ``io.BufferedIOBase`` interface, including ``seekable`` and ``readinto``, which
+        ``zipfile`` and ``libarchive`` rely on. Before Python 3.11, ``tempfile.SpooledTemporaryFile`` does not.
+    :param fmt: the format of the archive, one of the names returned by ``shutil.get_archive_formats``.
+    :return: generator of tuples of the filename and a binary stream with the content of each file in the archive.
+    :raises ValueError: if the format is not supported or the archive contains files in more than one directory.
+    :raises shutil.ReadError: if the archive could not be read.
+    """
+    import io
+    import pathlib
+    import shutil
+    import tarfile
+    import zipfile
+
+    modes_tar = {None: 'r|*', 'tar': 'r|', 'gztar': 'r|gz', 'bztar': 'r|bz2', 'xztar': 'r|xz'}
+
+    if fmt is not None and fmt != 'zip' and fmt not in modes_tar:
+        raise ValueError(f'unknown archive format `{fmt}`')
+
+    dirnames = set()
+
+    def get_filename(name):
+        """Return the filename of an archive member, verifying that all members are in the same directory."""
+        parts = pathlib.PurePosixPath(name).parts
+        dirnames.add(parts[:-1])
+
+        if len(parts) > 2 or len(dirnames) > 1:
+            raise ValueError('the archive should only contain files, optionally contained in a single directory')
+
+        return parts[-1]
+
+    try:
+        import libarchive
+    except ImportError:
+        libarchive = None
+
+    if hasattr(archive, 'read'):
+        archive.seek(0)
+
+    if libarchive is not None:
+        # The optional ``libarchive-c`` package wraps the native ``libarchive`` library, which releases the GIL while
+        # decompressing and deduces the format, including its compression, from the content of the archive.
+        try:
+            if hasattr(archive, 'read'):
+                reader = libarchive.stream_reader(archive)
+            else:
+                reader = libarchive.file_reader(str(archive))
+
+            with reader as entries:
+                for entry in entries:
+                    if entry.isfile:
+                        yield get_filename(entry.pathname), io.BytesIO(b''.join(entry.get_blocks()))
+        except libarchive.ArchiveError as exception:
+            raise shutil.ReadError(str(exception)) from exception
+        return
+
+    if hasattr(archive, 'read'):
+        is_zipfile = fmt == 'zip' or (fmt is None and zipfile.is_zipfile(archive))
+        archive.seek(0)
+    else:
+        is_zipfile = fmt == 'zip' or (fmt is None and zipfile.is_zipfile(archive))
+
+    try:
+        if is_zipfile:
+            with zipfile.ZipFile(archive) as handle:
+                for member in handle.infolist():
+                    if not member.is_dir():
+                        yield get_filename(member.filename), io.BytesIO(handle.read(member))
+        else:
+            source = {'fileobj': archive} if hasattr(archive, 'read') else {'name': archive}
+            with tarfile.open(mode=modes_tar[fmt], **source) as handle:
+                for member in handle:
+                    if member.isfile():
+                        yield get_filename(member.name), io.BytesIO(handle.extractfile(member).read())
+    except (tarfile.TarError, zipfile.BadZipFile) as exception:
+        raise shutil.ReadError(str(exception)) from exception
+
+
 def create_basis_set_from_archive(cls, label, filepath_archive, fmt=None, basis_type=None):
     """Construct a new basis set instance from a tar.gz archive.
 
     .. warning:: the archive should not contain any subdirectories, but just the basis files.
 
+    .. note:: the files are parsed directly from the archive, without unpacking it to disk. The md5 checksum of the
+        archive is stored on the basis set. If a basis set of the given class and label already exists that was
+        created from an archive with the same checksum, it is returned instead, without parsing the archive again.
+
     :param cls: the basis set class to use, e.g. ``OpenmxBasisSet``
     :param label: the label for the new basis set
-    :param filepath_archive: absolute filepath to the .tar.gz archive containing the basis set
-    :param fmt: the format of the archive, if not specified will attempt to guess based on extension of ``filepath``
+    :param filepath_archive: absolute filepath to the .tar.gz archive containing the basis set, or a seekable binary
+        filelike object with the content of the archive. If it is the path of a directory, for example of an archive
+        that was already unpacked, the basis set is created directly from the files in that directory.
+    :param fmt: the format of the archive, if not specified will attempt to guess based on its content.
     :param basis_type: subclass of ``BasisData`` to be used for the parsed bases. If not specified and
         the basis set only defines a single supported basis type in ``_basis_types`` then that will be used otherwise
         a ``ValueError`` is raised.
-    :return: newly created basis set
+    :return: newly created basis set, or the existing one created from the same archive.
     :raises OSError: if the archive could not be unpacked or bases in it could not be parsed into a basis set
     """
+    import contextlib
+    import os
     import shutil
-    import tempfile
 
-    with tempfile.TemporaryDirectory() as dirpath:
+    from aiida.orm import QueryBuilder
+    from aiida_basis.data.basis.basis import md5_from_file, md5_from_filelike
+
+    if not hasattr(filepath_archive, 'read') and os.path.isdir(filepath_archive):
+        return create_basis_set_from_directory(cls, label, filepath_archive, basis_type)
+
+    with contextlib.ExitStack() as stack:
+
+        if hasattr(filepath_archive, 'read'):
+            archive = filepath_archive
+            archive.seek(0)
+            archive_md5 = md5_from_filelike(archive)
+        else:
+            # The same handle is used to hash and to read the archive, such that the file is only opened once.
+            archive = stack.enter_context(open(filepath_archive, 'rb'))
+            archive_md5 = md5_from_file(archive)
+
+        filters = {'label': label, f'extras.{cls._key_archive_md5}': archive_md5}  # pylint: disable=protected-access
+        existing = QueryBuilder().append(cls, filters=filters).first()
+
+        if existing:
+            return existing[0]
 
         try:
-            shutil.unpack_archive(filepath_archive, dirpath, format=fmt)
+            streams = iter_archive_files(archive, fmt=fmt)
+            basis_set = cls.create_from_streams(streams, label, basis_type=basis_type)
         except shutil.ReadError as exception:
             raise OSError(f'failed to unpack the archive `{filepath_archive}`: {exception}') from exception
+        except ValueError as exception:
+            raise OSError(f'failed to parse bases from `{filepath_archive}`: {exception}') from exception
 
-        basis_set = create_basis_set_from_directory(cls, label, dirpath, basis_type)
+    basis_set.archive_md5 = archive_md5
 
     return basis_set
 
 
+def format_table(rows, headers=None) -> str:
+    """Format rows of values as a table with left-aligned columns that are separated by two spaces.
+
+    The layout resembles the ``simple`` format of ``tabulate`` if ``headers`` are defined and its ``plain`` format
+    otherwise, but it is not identical: all columns are left-aligned, values are formatted with ``str`` and headers are
+    not padded. The column widths are computed while the rows are consumed, so ``rows`` can be any iterable, such as a
+    generator.
+
+    :param rows: iterable of rows, each a sequence of values that are converted to strings.
+    :param headers: optional sequence of column headers, which are underlined with dashes.
+    :return: the formatted table.
+    """
+    widths = [len(header) for header in headers] if headers else None
+    table = []
+
+    for row in rows:
+        cells = [str(value) for value in row]
+        widths = [max(width, len(cell)) for width, cell in zip(widths or [0] * len(cells), cells)]
+        table.append(cells)
+
+    if widths is None:
+        return ''
+
+    def format_row(cells):
+        return '  '.join(cell.ljust(width) for cell, width in zip(cells, widths)).rstrip()
+
+    lines = [format_row(headers), '  '.join('-' * width for width in widths)] if headers else []
+    lines.extend(format_row(cells) for cells in table)
+
+    return '\n'.join(lines)
+
+
 def format_orbital_configuration(orbital_configuration: list) -> str:
     """Prettily format an orbital configuration.
 
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """Base class for data types representing bases."""
+import functools
+import hashlib
 import io
+import threading
 import typing
 import pathlib
 
@@ -8,10 +11,74 @@ from aiida import orm
 from aiida import plugins
 from aiida.common.constants import elements
 from aiida.common.exceptions import StoringNotAllowed
-from aiida.common.files import md5_from_filelike
 
 __all__ = ('BasisData',)
 
+MD5_BUFFER_SIZE = 2 * 1024 * 1024  # Size in bytes of the buffer into which content is read to compute md5 checksums
+
+_MD5_BUFFER = threading.local()
+
+
+def md5_from_filelike(stream: typing.BinaryIO) -> str:
+    """Return the md5 checksum of the content of a binary filelike object, read from its current position.
+
+    The content is read incrementally into a buffer that is reused between calls by the same thread, such that the
+    content never has to be loaded into memory in its entirety.
+
+    :param stream: a filelike object with the binary content.
+    :return: the hexadecimal md5 checksum.
+    """
+    # ``file_digest`` hashes the entire buffer of objects with ``getbuffer``, such as ``io.BytesIO``, regardless of
+    # their current position, so it is only used for actual files, which it reads from their current position.
+    if hasattr(hashlib, 'file_digest') and hasattr(stream, 'fileno') and not hasattr(stream, 'getbuffer'):
+        try:
+            return hashlib.file_digest(stream, 'md5').hexdigest()  # pylint: disable=no-member
+        except ValueError:
+            # The stream does not support the interface required by ``file_digest``, which is checked before reading.
+            pass
+
+    md5 = hashlib.md5()
+
+    if not hasattr(stream, 'readinto'):
+        for chunk in iter(lambda: stream.read(MD5_BUFFER_SIZE), b''):
+            md5.update(chunk)
+        return md5.hexdigest()
+
+    buffer = getattr(_MD5_BUFFER, 'view', None)
+
+    if buffer is None:
+        buffer = _MD5_BUFFER.view = memoryview(bytearray(MD5_BUFFER_SIZE))
+
+    while True:
+        size = stream.readinto(buffer)
+        if not size:
+            break
+        md5.update(buffer[:size])
+
+    return md5.hexdigest()
+
+
+def md5_from_file(handle: typing.BinaryIO) -> str:
+    """Return the md5 checksum of the entire content of a file on disk that is opened in binary mode.
+
+    The file is memory mapped, such that it is hashed in a single call, without copying its content into Python
+    objects, and its pages remain in the page cache for subsequent reads of the same file. The mapping is released
+    before this function returns, so callers that hash many files only need to close each handle to release all of its
+    resources. If the file cannot be memory mapped, for example because it is empty, it is hashed with
+    ``md5_from_filelike`` instead.
+
+    :param handle: a file on disk opened in binary mode.
+    :return: the hexadecimal md5 checksum.
+    """
+    import mmap
+
+    try:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.md5(mapped).hexdigest()
+    except (ValueError, OSError, io.UnsupportedOperation):
+        handle.seek(0)
+        return md5_from_filelike(handle)
+
 
 class BasisData(plugins.DataFactory('singlefile')):
     """Base class for data types representing bases."""
@@ -41,9 +108,13 @@ class BasisData(plugins.DataFactory('singlefile')):
         return basis
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_entry_point_name(cls):
         """Return the entry point name associated with this data class.
 
+        .. note:: resolving the entry point requires scanning the registered entry points, so the result is cached for
+            each class.
+
         :return: the entry point name.
         """
         from aiida.plugins.entry_point import get_entry_point_from_class
@@ -113,7 +184,10 @@ class BasisData(plugins.DataFactory('singlefile')):
         """
         super().set_file(stream, filename, **kwargs)
         stream.seek(0)
-        self.md5 = md5_from_filelike(stream)
+
+        # The checksum is computed from the content that was just written, so there is no need to validate it against
+        # the stored file, which would require reading it once more. It is still validated when the node is stored.
+        self.set_attribute(self._key_md5, md5_from_filelike(stream))
 
     def store(self, **kwargs):
         """Store the node verifying first that all required attributes are set.
@@ -165,5 +239,7 @@ class BasisData(plugins.DataFactory('singlefile')):
         :param value: the md5 checksum.
         :raises ValueError: if the md5 does not match that of the currently stored file.
         """
-        self.validate_md5(value)
+        if value != self.md5:
+            self.validate_md5(value)
+
         self.set_attribute(self._key_md5, value)
@@ -1,22 +1,43 @@
 # -*- coding: utf-8 -*-
 """Module for data plugin to represent a basis in PAO format."""
+import math
 import re
 import typing
 import pathlib
 
-from aiida.common.constants import elements
-
 from .basis import BasisData
 
 __all__ = ('PaoData',)
 
-PATTERN_FLOAT = r'[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?'
-REGEX_ATOMIC_NUMBER = re.compile(r"""\s*AtomSpecies\s*(?P<atomic_number>[\d]{1,3})\s*""", re.I)
-REGEX_Z_VALENCE = re.compile(r"""\s*valence\.electron\s*(?P<z_valence>""" + PATTERN_FLOAT + r""")\s*""", re.I)
-REGEX_R_CUTOFF = re.compile(r"""\s*radial\.cutoff\.pao\s*(?P<r_cutoff>""" + PATTERN_FLOAT + r""")\s*""", re.I)
-REGEX_MAX_OCC_N = re.compile(r"""\s*max\.o[c]{1,2}upied\.N\s*(?P<max_occ_n>[\d]+)\s*""", re.I)
-REGEX_MAX_L = re.compile(r"""\s*maxL\.pao\s*(?P<max_l>[\d]+)\s*""", re.I)
-REGEX_NUM_PAO = re.compile(r"""\s*num\.pao\s*(?P<num_pao>[\d]+)\s*""", re.I)
+HEADER_CHUNK_SIZE = 64 * 1024  # Size in bytes of the chunks in which the content is read to parse the header
+
+# Header keywords are ASCII and always start a line, so the patterns are anchored to the start of lines. The patterns
+# are lowercase and are matched against lowercased content, which avoids case-insensitive matching.
+REGEX_FLAGS = re.ASCII | re.MULTILINE
+REGEX_ATOMIC_NUMBER = re.compile(r"""^\s*atomspecies\s*(?P<atomic_number>[\d]{1,3})""", REGEX_FLAGS)
+REGEX_Z_VALENCE = re.compile(r"""^\s*valence\.electron\s+(?P<z_valence>\S+)""", REGEX_FLAGS)
+REGEX_R_CUTOFF = re.compile(r"""^\s*radial\.cutoff\.pao\s+(?P<r_cutoff>\S+)""", REGEX_FLAGS)
+REGEX_MAX_OCC_N = re.compile(r"""^\s*max\.o[c]{1,2}upied\.n\s*(?P<max_occ_n>[\d]+)""", REGEX_FLAGS)
+REGEX_MAX_L = re.compile(r"""^\s*maxl\.pao\s*(?P<max_l>[\d]+)""", REGEX_FLAGS)
+REGEX_NUM_PAO = re.compile(r"""^\s*num\.pao\s*(?P<num_pao>[\d]+)""", REGEX_FLAGS)
+
+
+def _search(regex: typing.Pattern, keyword: str, content: str) -> typing.Optional[typing.Match]:
+    """Search the content with the regex, unless the keyword does not occur in the content at all.
+
+    A substring test is much cheaper than a regex search, so content that cannot match is rejected without invoking the
+    regex engine. The patterns are written in lowercase, so the content should be lowercased once by the caller, which
+    is cheaper than having the regex engine fold the case of every character it compares.
+
+    :param regex: the compiled regex to search with.
+    :param keyword: lowercase literal that any match of the regex contains.
+    :param content: the lowercased content of the file.
+    :return: the match or None if there is no match.
+    """
+    if keyword not in content:
+        return None
+
+    return regex.search(content)
 
 
 def parse_element(content: str):
@@ -25,7 +46,9 @@ def parse_element(content: str):
     :param content: the decoded content of the file.
     :return: the symbol of the element following the IUPAC naming standard.
     """
-    match = REGEX_ATOMIC_NUMBER.search(content)
+    from aiida.common.constants import elements
+
+    match = _search(REGEX_ATOMIC_NUMBER, 'atomspecies', content.lower())
 
     if match:
         atomic_number = match.group('atomic_number')
@@ -55,7 +78,7 @@ def parse_z_valence(content: str):
     :param content: the decoded content of the file.
     :return: the number of valence electrons for which the basis was generated.
     """
-    match = REGEX_Z_VALENCE.search(content)
+    match = _search(REGEX_Z_VALENCE, 'valence.electron', content.lower())
 
     if match:
         z_valence = match.group('z_valence')
@@ -65,7 +88,7 @@ def parse_z_valence(content: str):
         except ValueError as exception:
             raise ValueError(f'parsed value for the Z valence `{z_valence}` is not a valid number.') from exception
 
-        if int(z_valence) != z_valence:
+        if not z_valence.is_integer():
             raise ValueError(f'parsed value for the Z valence `{z_valence}` is not an integer')
 
         return int(z_valence)
@@ -79,7 +102,7 @@ def parse_r_cutoff(content: str):
     :param content: the decoded content of the file.
     :return: the radial cutoff in Bohr.
     """
-    match = REGEX_R_CUTOFF.search(content)
+    match = _search(REGEX_R_CUTOFF, 'radial.cutoff.pao', content.lower())
 
     if match:
         r_cutoff = match.group('r_cutoff')
@@ -89,7 +112,10 @@ def parse_r_cutoff(content: str):
         except ValueError as exception:
             raise ValueError(f'parsed value for the radial cutoff `{r_cutoff}` is not a valid number.') from exception
 
-        return float(r_cutoff)
+        if not math.isfinite(r_cutoff):
+            raise ValueError(f'parsed value for the radial cutoff `{r_cutoff}` is not a valid number.')
+
+        return r_cutoff
 
     raise ValueError(f'could not parse the radial cutoff from the PAO content: {content}')
 
@@ -100,7 +126,7 @@ def parse_max_occ_n(content: str):
     :param content: the decoded content of the file.
     :return: the maximum occupied `n`
     """
-    match = REGEX_MAX_OCC_N.search(content)
+    match = _search(REGEX_MAX_OCC_N, 'upied.n', content.lower())
 
     if match:
         max_occ_n = match.group('max_occ_n')
@@ -123,7 +149,7 @@ def parse_max_l(content: str):
     :param content: the decoded content of the file.
     :return: the maximum `l`
     """
-    match = REGEX_MAX_L.search(content)
+    match = _search(REGEX_MAX_L, 'maxl.pao', content.lower())
 
     if match:
         max_l = match.group('max_l')
@@ -144,7 +170,7 @@ def parse_num_pao(content: str):
     :param content: the decoded content of the file.
     :return: the number of PAOs
     """
-    match = REGEX_NUM_PAO.search(content)
+    match = _search(REGEX_NUM_PAO, 'num.pao', content.lower())
 
     if match:
         num_pao = match.group('num_pao')
@@ -159,6 +185,116 @@ def parse_num_pao(content: str):
     raise ValueError(f'could not parse the number of PAOs from the PAO content: {content}')
 
 
+def scan_header(content: str, values: dict = None) -> dict:
+    """Scan the content of the PAO file for the values that are defined in its header.
+
+    Each header line starts with a keyword that is looked up in ``HEADER_KEYWORDS``, such that only the lines that
+    define a header field are converted and validated, by the corresponding ``parse_*`` function. The scan stops as soon
+    as every field has been found.
+
+    :param content: the decoded content of the file, or of a part of it consisting of complete lines.
+    :param values: optional dictionary with the values found by scanning the preceding part of the content, which is
+        updated in place with the values that are not yet defined in it.
+    :return: dictionary with the values that were found, with a subset of the keys ``element``, ``z_valence``,
+        ``r_cutoff``, ``max_occ_n``, ``max_l`` and ``num_pao``.
+    :raises ValueError: if any of the values that were found is invalid.
+    """
+    if values is None:
+        values = {}
+
+    if len(values) == len(HEADER_PARSERS):
+        return values
+
+    for line in content.splitlines():
+        tokens = line.split(None, 1)
+
+        if not tokens:
+            continue
+
+        try:
+            key, parser = HEADER_KEYWORDS[tokens[0].lower()]
+        except KeyError:
+            continue
+
+        if key not in values:
+            values[key] = parser(line)
+
+        if len(values) == len(HEADER_PARSERS):
+            break
+
+    return values
+
+
+def parse_header(content: str) -> dict:
+    """Parse the content of the PAO file to determine all the values that are defined in its header.
+
+    :param content: the decoded content of the file.
+    :return: dictionary with the element, Z valence, radial cutoff, maximum occupied `n`, maximum `l` and number of
+        PAOs, with the keys ``element``, ``z_valence``, ``r_cutoff``, ``max_occ_n``, ``max_l`` and ``num_pao``.
+    :raises ValueError: if any of the values could not be parsed.
+    """
+    values = scan_header(content)
+
+    for key, parser in HEADER_PARSERS.items():
+        if key not in values:
+            # This will raise the exception of the parser that corresponds to the value that could not be found.
+            values[key] = parser(content)
+
+    return values
+
+
+def parse_header_from_stream(stream: typing.BinaryIO) -> dict:
+    """Parse the header of a PAO file from a binary stream, reading only as much of the content as is necessary.
+
+    The stream is read in chunks of ``HEADER_CHUNK_SIZE`` bytes until all header fields have been found. Only complete
+    lines are scanned, such that a value is never cut off at the boundary of a chunk. Each line is decoded and scanned
+    only once: the offset of the end of the last complete line that was scanned is kept, such that for each chunk only
+    the lines that it completes are scanned. If the end of the stream is reached before all fields were found, the
+    entire content is parsed, which will raise for the missing fields.
+
+    :param stream: a filelike object with the binary content of the file, read from its current position.
+    :return: dictionary with the element, Z valence, radial cutoff, maximum occupied `n`, maximum `l` and number of
+        PAOs, with the keys ``element``, ``z_valence``, ``r_cutoff``, ``max_occ_n``, ``max_l`` and ``num_pao``.
+    :raises ValueError: if any of the values could not be parsed.
+    """
+    content = bytearray()
+    values = {}
+    offset = 0
+
+    for chunk in iter(lambda: stream.read(HEADER_CHUNK_SIZE), b''):
+        content.extend(chunk)
+        end = content.rfind(b'\n', offset) + 1
+
+        # A newline byte never occurs within a multi-byte UTF-8 sequence, so complete lines can be decoded separately.
+        if end > offset:
+            scan_header(content[offset:end].decode('utf-8'), values)
+            offset = end
+
+        if len(values) == len(HEADER_PARSERS):
+            return values
+
+    return parse_header(content.decode('utf-8'))
+
+
+HEADER_PARSERS = {
+    'element': parse_element,
+    'z_valence': parse_z_valence,
+    'r_cutoff': parse_r_cutoff,
+    'max_occ_n': parse_max_occ_n,
+    'max_l': parse_max_l,
+    'num_pao': parse_num_pao,
+}
+HEADER_KEYWORDS = {
+    'atomspecies': ('element', parse_element),
+    'valence.electron': ('z_valence', parse_z_valence),
+    'radial.cutoff.pao': ('r_cutoff', parse_r_cutoff),
+    'max.occupied.n': ('max_occ_n', parse_max_occ_n),
+    'max.ocupied.n': ('max_occ_n', parse_max_occ_n),
+    'maxl.pao': ('max_l', parse_max_l),
+    'num.pao': ('num_pao', parse_num_pao),
+}
+
+
 class PaoData(BasisData):
     """Data plugin to represent a basis in PAO format."""
 
@@ -181,13 +317,43 @@ class PaoData(BasisData):
 
         source.seek(0)
 
-        content = source.read().decode('utf-8')
-        self.element = parse_element(content)
-        self.z_valence = parse_z_valence(content)
-        self.r_cutoff = parse_r_cutoff(content)
-        self.max_occ_n = parse_max_occ_n(content)
-        self.max_l = parse_max_l(content)  # pylint: disable=attribute-defined-outside-init
-        self.num_pao = parse_num_pao(content)
+        header = parse_header_from_stream(source)
+
+        self.validate_element(header['element'])
+        self.validate_r_cutoff(header['r_cutoff'])
+
+        for key in ('z_valence', 'max_occ_n', 'max_l', 'num_pao'):
+            self.validate_positive_integer(header[key])
+
+        # All attributes are validated first and then set at once, instead of each through its own property setter.
+        self.set_attribute_many({
+            self._key_element: header['element'],
+            self._key_z_valence: header['z_valence'],
+            self._key_r_cutoff: header['r_cutoff'],
+            self._key_max_occ_n: header['max_occ_n'],
+            self._key_max_l: header['max_l'],
+            self._key_num_pao: header['num_pao'],
+        })
+
+    @staticmethod
+    def validate_positive_integer(value: int):
+        """Validate that the given value is a positive integer.
+
+        :param value: the value.
+        :raises ValueError: if the value is not a positive integer
+        """
+        if not isinstance(value, int) or value < 0:
+            raise ValueError(f'`{value}` is not a positive integer.')
+
+    @staticmethod
+    def validate_r_cutoff(value: float):
+        """Validate the radial cutoff.
+
+        :param value: the radial cutoff.
+        :raises ValueError: if the value is not a positive float
+        """
+        if not isinstance(value, float) or value <= 0:
+            raise ValueError(f'`{value}` is not a positive float.')
 
     @property
     def z_valence(self) -> typing.Union[int, None]:  # pylint: disable=unsubscriptable-object
@@ -204,9 +370,7 @@ class PaoData(BasisData):
         :param value: the valence.
         :raises ValueError: if the value is not a positive integer
         """
-        if not isinstance(value, int) or value < 0:
-            raise ValueError(f'`{value}` is not a positive integer.')
-
+        self.validate_positive_integer(value)
         self.set_attribute(self._key_z_valence, value)
 
     @property
@@ -224,9 +388,7 @@ class PaoData(BasisData):
         :param value: the radial cutoff.
         :raises ValueError: if the value is not a positive float
         """
-        if not isinstance(value, float) or value <= 0:
-            raise ValueError(f'`{value}` is not a positive float.')
-
+        self.validate_r_cutoff(value)
         self.set_attribute(self._key_r_cutoff, value)
 
     @property
@@ -244,30 +406,26 @@ class PaoData(BasisData):
         :param value: the maximum occupied `n`.
         :raises ValueError: if the value is not a positive integer
         """
-        if not isinstance(value, int) or value < 0:
-            raise ValueError(f'`{value}` is not a positive integer.')
-
+        self.validate_positive_integer(value)
         self.set_attribute(self._key_max_occ_n, value)
 
     @property
-    def key_max_l(self) -> typing.Union[int, None]:  # pylint: disable=unsubscriptable-object
+    def max_l(self) -> typing.Union[int, None]:  # pylint: disable=unsubscriptable-object
         """Return the maximum `l`.
 
         :return: the maximum `l`
         """
-        return self.get_attribute(self._key_key_max_l, None)
+        return self.get_attribute(self._key_max_l, None)
 
-    @key_max_l.setter
-    def key_max_l(self, value: int):
+    @max_l.setter
+    def max_l(self, value: int):
         """Set the maximum `l`.
 
         :param value: the maximum `l`
         :raises ValueError: if the value is not a positive integer
         """
-        if not isinstance(value, int) or value < 0:
-            raise ValueError(f'`{value}` is not a positive integer.')
-
-        self.set_attribute(self._key_key_max_l, value)
+        self.validate_positive_integer(value)
+        self.set_attribute(self._key_max_l, value)
 
     @property
     def num_pao(self) -> typing.Union[int, None]:  # pylint: disable=unsubscriptable-object
@@ -284,7 +442,5 @@ class PaoData(BasisData):
         :param value: the number of PAOs
         :raises ValueError: if the value is not a positive integer
         """
-        if not isinstance(value, int) or value < 0:
-            raise ValueError(f'`{value}` is not a positive integer.')
-
+        self.validate_positive_integer(value)
         self.set_attribute(self._key_num_pao, value)
@@ -2,6 +2,6 @@
 """Mixins."""
 
 from . import orbital_configurations
-from .orbital_configurations import RecommendedOrbitalConfigurationMixin
+from .orbital_configurations import OrbitalConfiguration, RecommendedOrbitalConfigurationMixin
 
 __all__ = orbital_configurations.__all__
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 """Mixin that adds support of recommended orbital configurations to a ``Group`` subclass, using its extras."""
+import collections
+import sys
 from typing import Union
 
 from aiida.common.lang import type_check
@@ -7,7 +9,9 @@ from aiida.plugins import DataFactory
 
 StructureData = DataFactory('structure')  # pylint: disable=invalid-name
 
-__all__ = ('RecommendedOrbitalConfigurationMixin',)
+__all__ = ('OrbitalConfiguration', 'RecommendedOrbitalConfigurationMixin')
+
+OrbitalConfiguration = collections.namedtuple('OrbitalConfiguration', ['s', 'p', 'd', 'f'])
 
 
 class RecommendedOrbitalConfigurationMixin:
@@ -30,22 +34,22 @@ class RecommendedOrbitalConfigurationMixin:
             match exactly, or if the orbital configurations dictionary has an invalid format.
         """
         elements_family = set(elements)
+        elements_orbital_configurations = orbital_configurations.keys()
 
-        elements_orbital_configurations = set(orbital_configurations.keys())
-        elements_diff = elements_family ^ elements_orbital_configurations
-
-        if elements_family < elements_orbital_configurations:
-            raise ValueError(f'orbital configurations defined for unsupported elements: {elements_diff}')
+        extra = elements_orbital_configurations - elements_family
+        if extra:
+            raise ValueError(f'orbital configurations defined for unsupported elements: {extra}')
 
-        if elements_family > elements_orbital_configurations:
-            raise ValueError(f'orbital configurations not defined for all family elements: {elements_diff}')
+        missing = elements_family - elements_orbital_configurations
+        if missing:
+            raise ValueError(f'orbital configurations not defined for all family elements: {missing}')
 
         for element, orbital_configuration in orbital_configurations.items():
             if len(orbital_configuration) != 4:
                 raise ValueError(
                     f'invalid length of orbital configuration for element {element}: {orbital_configuration}'
                 )
-            if any(not isinstance(n, int) for n in orbital_configuration):
+            if not all(isinstance(n, int) for n in orbital_configuration):
                 raise ValueError(f'invalid orbital configuration values for element {element}: {orbital_configuration}')
 
     def _get_orbital_configurations(self) -> dict:
@@ -53,7 +57,22 @@ class RecommendedOrbitalConfigurationMixin:
 
         :return: the orbital_configurations extra or an empty dictionary if it has not yet been set.
         """
-        return self.get_extra(self._key_orbital_configurations, {})
+        return self._normalize_orbital_configurations(self.get_extra(self._key_orbital_configurations, {}))
+
+    @staticmethod
+    def _normalize_orbital_configurations(orbital_configurations: dict) -> dict:
+        """Return a copy of valid orbital configurations with interned element symbols and ``OrbitalConfiguration``s.
+
+        Extras are serialized to JSON, which turns tuples into lists, so this is applied both when setting and when
+        getting the orbital configurations, such that they are always returned in the documented format.
+
+        :param orbital_configurations: dictionary with valid orbital configurations.
+        :return: dictionary with interned element symbols as keys and ``OrbitalConfiguration`` instances as values.
+        """
+        return {
+            sys.intern(element): OrbitalConfiguration(*orbital_configuration)
+            for element, orbital_configuration in orbital_configurations.items()
+        }
 
     def set_orbital_configurations(self, orbital_configurations: dict) -> None:
         """Set the recommended orbital_configurations for the pseudos in this family.
@@ -63,14 +82,14 @@ class RecommendedOrbitalConfigurationMixin:
             element symbol for which the basis set contains a basis.
         :raises ValueError: if the orbital_configurations have an invalid format
         """
-        self.validate_orbital_configurations(set(self.elements), orbital_configurations)
-        self.set_extra(self._key_orbital_configurations, orbital_configurations)
+        self.validate_orbital_configurations(self.elements, orbital_configurations)
+        self.set_extra(self._key_orbital_configurations, self._normalize_orbital_configurations(orbital_configurations))
 
     def get_orbital_configurations(self) -> Union[dict, None]:
         """Return a set of orbital_configurations.
 
-        :return: the orbital_configurations or ``None`` if no orbital_configurations whatsoever have been defined for
-            this basis set.
+        :return: the orbital_configurations, with an ``OrbitalConfiguration`` for each element, or an empty dictionary
+            if no orbital_configurations whatsoever have been defined for this basis set.
         """
         return self._get_orbital_configurations()
 
@@ -82,7 +101,7 @@ class RecommendedOrbitalConfigurationMixin:
         :param elements: single or tuple of elements.
         :param structure: a ``StructureData`` node.
         :return: dictionary of recommended orbital configurations.
-        :raises: ValueError if one of the elements does not have an orbital configuration defined
+        :raises: ValueError if any of the elements does not have an orbital configuration defined
         """
         if (elements is None and structure is None) or (elements is not None and structure is not None):
             raise ValueError('at least one and only one of `elements` or `structure` should be defined')
@@ -99,11 +118,9 @@ class RecommendedOrbitalConfigurationMixin:
 
         orbital_configurations = self.get_orbital_configurations()
 
-        values = {}
-        for element in symbols:
-            try:
-                values[element] = orbital_configurations[element]
-            except KeyError as exception:
-                raise ValueError(f'element {element} does not have an orbital configuration defined') from exception
+        missing = set(symbols) - orbital_configurations.keys()
+
+        if missing:
+            raise ValueError(f'element(s) {", ".join(sorted(missing))} do not have an orbital configuration defined')
 
-        return values
+        return {element: orbital_configurations[element] for element in symbols}
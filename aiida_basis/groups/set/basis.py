@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """Subclass of ``Group`` that serves as a base class for representing basis sets."""
 import os
-import re
+import pathlib
+import string
 from typing import Union, List, Tuple, Mapping
 
 from aiida.common import exceptions
@@ -15,6 +16,8 @@ __all__ = ('BasisSet',)
 
 StructureData = DataFactory('structure')
 
+ELEMENT_FILENAME_CHARACTERS = frozenset(string.ascii_letters)
+
 
 class BasisSet(Group):
     """Group to represent a basis set.
@@ -26,6 +29,7 @@ class BasisSet(Group):
     """
 
     _key_basis_type = '_basis_type'
+    _key_archive_md5 = '_archive_md5'
     _basis_types = (BasisData,)
     _bases = None
 
@@ -55,6 +59,14 @@ class BasisSet(Group):
         """
         return cls._basis_types
 
+    @classmethod
+    def get_entry_point_name(cls):
+        """Return the entry point name associated with this group class.
+
+        :return: the entry point name.
+        """
+        return cls._type_string
+
     @classmethod
     def _validate_basis_type(cls, basis_type):
         """Validate the ``basis_type`` passed to ``parse_bases_from_directory``.
@@ -66,7 +78,7 @@ class BasisSet(Group):
 
         basis_type = basis_type or cls._basis_types[0]
 
-        if all(not issubclass(basis_type, supported_type) for supported_type in cls._basis_types):
+        if not issubclass(basis_type, cls._basis_types):
             raise ValueError(f'`{basis_type}` is not supported by `{cls}`.')
 
         return basis_type
@@ -80,13 +92,113 @@ class BasisSet(Group):
         if not os.path.isdir(dirpath):
             raise ValueError(f'`{dirpath}` is not a directory')
 
-        dirpath_contents = os.listdir(dirpath)
+        with os.scandir(dirpath) as iterator:
+            dirpath_contents = list(iterator)
 
-        if len(dirpath_contents) == 1 and os.path.isdir(os.path.join(dirpath, dirpath_contents[0])):
-            dirpath = os.path.join(dirpath, dirpath_contents[0])
+        if len(dirpath_contents) == 1 and dirpath_contents[0].is_dir():
+            dirpath = dirpath_contents[0].path
 
         return dirpath
 
+    @classmethod
+    def _parse_basis(cls, stream, filename, basis_type):
+        """Parse a single basis file into a data node.
+
+        :param stream: a binary filelike object with the content of the basis file, or the absolute filepath of the
+            basis file, in which case the file is only opened while it is being parsed.
+        :param filename: the filename of the basis file.
+        :param basis_type: subclass of ``BasisData`` to be used for the parsed basis.
+        :return: the data node.
+        :raises ParsingError: if the constructor of the basis type fails or the element cannot be determined.
+        """
+        from aiida.common.exceptions import ParsingError
+
+        if isinstance(stream, (str, pathlib.Path)):
+            with open(stream, 'rb') as handle:
+                return cls._parse_basis(handle, filename, basis_type)
+
+        try:
+            basis = basis_type(stream, filename=filename)
+        except ParsingError as exception:
+            raise ParsingError(f'failed to parse `{filename}`: {exception}') from exception
+
+        if basis.element is None:
+            prefix, _, extension = filename.partition('.')
+            if not 1 <= len(prefix) <= 2 or not ELEMENT_FILENAME_CHARACTERS.issuperset(prefix) or not extension:
+                raise ParsingError(
+                    f'`{basis.__class__}` constructor did not define the element and could not parse a valid '
+                    f'element symbol from the filename `{filename}` either. It should have the format '
+                    '`ELEMENT.EXTENSION`'
+                )
+            basis.element = prefix
+
+        return basis
+
+    @classmethod
+    def _parse_bases(cls, streams, basis_type, deduplicate, md5s=None):
+        """Parse the basis files provided as binary streams into a list of data nodes.
+
+        :param streams: list of tuples of the filename and a seekable binary filelike object with the content of each
+            file, or its absolute filepath if ``md5s`` are specified or ``deduplicate`` is False.
+        :param basis_type: subclass of ``BasisData`` to be used for the parsed bases.
+        :param deduplicate: if True, will scan database for existing bases of same type and with the same md5 checksum,
+            and use those instead of the parsed ones. The database is queried once for all the streams. Streams whose
+            content is identical to that of a preceding stream are skipped with a warning.
+        :param md5s: optional list with the md5 checksum of each stream, in the same order, if these have already been
+            computed. Otherwise they are computed from the streams when deduplicating.
+        :return: list of data nodes.
+        :raises ParsingError: if the constructor of the basis type fails for one of the streams.
+        """
+        import warnings
+        from aiida_basis.data.basis.basis import md5_from_filelike
+
+        if not deduplicate or not streams:
+            return [cls._parse_basis(stream, filename, basis_type) for filename, stream in streams]
+
+        if md5s is None:
+            md5s = []
+            for _, stream in streams:
+                md5s.append(md5_from_filelike(stream))
+                stream.seek(0)
+
+        unique = {}
+
+        for (filename, stream), md5 in zip(streams, md5s):
+            if md5 in unique:
+                warnings.warn(f'skipping `{filename}` since its content is identical to that of `{unique[md5][0]}`')
+                continue
+
+            unique[md5] = (filename, stream)
+
+        key_md5 = f'attributes.{basis_type._key_md5}'  # pylint: disable=protected-access
+        query = QueryBuilder().append(basis_type, subclassing=False, filters={key_md5: {'in': list(unique)}})
+        existing = {basis.md5: basis for basis, in query.iterall()}
+
+        bases = []
+
+        # Existing bases already define their element, so only the streams without a match have to be parsed.
+        for md5, (filename, stream) in unique.items():
+            basis = existing.get(md5)
+            bases.append(basis if basis is not None else cls._parse_basis(stream, filename, basis_type))
+
+        return bases
+
+    @classmethod
+    def _validate_bases(cls, bases, source):
+        """Validate the bases that were parsed from the given source.
+
+        :param bases: list of data nodes.
+        :param source: description of where the bases were parsed from, used in exception messages.
+        :raises ValueError: if no bases were parsed or the source contains multiple bases for the same element.
+        """
+        if not bases:
+            raise ValueError(f'no bases were parsed from `{source}`')
+
+        elements = set(basis.element for basis in bases)
+
+        if len(bases) != len(elements):
+            raise ValueError(f'`{source}` contains bases with duplicate elements')
+
     @classmethod
     def parse_bases_from_directory(cls, dirpath, basis_type=None, deduplicate=True):
         """Parse the basis files in the given directory into a list of data nodes.
@@ -101,74 +213,90 @@ class BasisSet(Group):
             the basis set only defines a single supported basis type in ``_basis_types`` then that will be used,
             otherwise a ``ValueError`` is raised.
         :param deduplicate: if True, will scan database for existing bases of same type and with the same
-            md5 checksum, and use that instead of the parsed one.
+            md5 checksum, and use that instead of the parsed one. Files whose content is identical to that of a
+            preceding file are skipped with a ``UserWarning``, instead of being considered duplicate elements.
         :return: list of data nodes
         :raises ValueError: if ``dirpath`` is not a directory or contains anything other than files.
-        :raises ValueError: if ``dirpath`` contains multiple bases for the same element.
+        :raises ValueError: if ``dirpath`` contains multiple bases for the same element, except for files with identical
+            content if ``deduplicate`` is True.
         :raises ValueError: if ``basis_type`` is explicitly specified and is not supported by this basis set class.
         :raises ValueError: if ``basis_type`` is not specified and the class supports more than one basis type.
         :raises ParsingError: if the constructor of the basis type fails for one of the files in the ``dirpath``.
         """
-        from aiida.common.exceptions import ParsingError
+        from concurrent.futures import ThreadPoolExecutor
+        from aiida_basis.data.basis.basis import md5_from_file
 
-        bases = []
         dirpath = cls._validate_dirpath(dirpath)
         basis_type = cls._validate_basis_type(basis_type)
 
-        for filename in os.listdir(dirpath):
-            filepath = os.path.join(dirpath, filename)
+        # The entries are sorted, such that it is deterministic which of the files with identical content is kept.
+        with os.scandir(dirpath) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
 
-            if not os.path.isfile(filepath):
+        def hash_file(entry):
+            # The type of the entry is typically known from reading the directory, so this does not require a stat call.
+            if not entry.is_file():
                 raise ValueError(f'dirpath `{dirpath}` contains at least one entry that is not a file')
 
-            with open(filepath, 'rb') as handle:
-                try:
-                    if deduplicate:
-                        basis = basis_type.get_or_create(handle, filename=filename)
-                    else:
-                        basis = basis_type(handle, filename=filename)
-                except ParsingError as exception:
-                    raise ParsingError(f'failed to parse `{filepath}`: {exception}') from exception
-
-            if basis.element is None:
-                match = re.search(r'^([A-Za-z]{1,2})\.\w+', filename)
-                if match is None:
-                    raise ParsingError(
-                        f'`{basis.__class__}` constructor did not define the element and could not parse a valid '
-                        'element symbol from the filename `{filename}` either. It should have the format '
-                        '`ELEMENT.EXTENSION`'
-                    )
-                basis.element = match.group(1)
-            bases.append(basis)
+            if not deduplicate:
+                return None
 
-        if not bases:
-            raise ValueError(f'no bases were parsed from `{dirpath}`')
+            # The file is closed before the worker moves on to the next entry, such that at most one file per worker is
+            # open at any time, regardless of the number of files in the directory.
+            with open(entry.path, 'rb') as handle:
+                return md5_from_file(handle)
 
-        elements = set(basis.element for basis in bases)
+        # The files are hashed in parallel, since ``hashlib`` releases the GIL for large buffers. The files are then
+        # opened and parsed one at a time, in this thread only, since the database backend is not guaranteed to be
+        # thread-safe and parsing does not release the GIL. Their content was just read while hashing, so it can be
+        # expected to still be in the page cache of the operating system.
+        with ThreadPoolExecutor(max_workers=min(32, len(entries)) or 1) as executor:
+            md5s = list(executor.map(hash_file, entries))
 
-        if len(bases) != len(elements):
-            raise ValueError(f'directory `{dirpath}` contains bases with duplicate elements')
+        streams = [(entry.name, entry.path) for entry in entries]
+        bases = cls._parse_bases(streams, basis_type, deduplicate, md5s if deduplicate else None)
+
+        cls._validate_bases(bases, dirpath)
 
         return bases
 
     @classmethod
-    def create_from_folder(cls, dirpath, label, *, description='', basis_type=None, deduplicate=True):
-        """Create a new ``BasisSet`` from the bases contained in a directory.
+    def parse_bases_from_streams(cls, streams, basis_type=None, deduplicate=True):
+        """Parse the basis files provided as binary streams into a list of data nodes.
 
-        :param dirpath: absolute path to the folder containing the UPF files.
-        :param label: label to give to the ``BasisSet``, should not already exist.
-        :param description: description to give to the basis set.
+        This allows to parse bases from a source that does not exist as a directory on disk, such as the members of an
+        archive, without having to write them to disk first.
+
+        :param streams: iterable of tuples of the filename and a binary filelike object with the content of each file.
         :param basis_type: subclass of ``BasisData`` to be used for the parsed bases. If not specified and
             the basis set only defines a single supported basis type in ``_basis_types`` then that will be used,
             otherwise a ``ValueError`` is raised.
         :param deduplicate: if True, will scan database for existing bases of same type and with the same
-            md5 checksum, and use that instead of the parsed one.
-        :raises ValueError: if a ``BasisSet`` already exists with the given name.
-        :raises ValueError: if ``dirpath`` is not a directory or contains anything other than files.
-        :raises ValueError: if ``dirpath`` contains multiple bases for the same element.
+            md5 checksum, and use that instead of the parsed one. Files whose content is identical to that of a
+            preceding file are skipped with a ``UserWarning``, instead of being considered duplicate elements.
+        :return: list of data nodes
+        :raises ValueError: if the streams contain multiple bases for the same element, except for streams with
+            identical content if ``deduplicate`` is True.
         :raises ValueError: if ``basis_type`` is explicitly specified and is not supported by this basis set class.
         :raises ValueError: if ``basis_type`` is not specified and the class supports more than one basis type.
-        :raises ParsingError: if the constructor of the basis type fails for one of the files in the ``dirpath``.
+        :raises ParsingError: if the constructor of the basis type fails for one of the streams.
+        """
+        basis_type = cls._validate_basis_type(basis_type)
+        bases = cls._parse_bases(list(streams), basis_type, deduplicate)
+
+        cls._validate_bases(bases, 'streams')
+
+        return bases
+
+    @classmethod
+    def _create_from_bases(cls, label, description, parse_bases):
+        """Create a new ``BasisSet`` with the given label from the bases returned by ``parse_bases``.
+
+        :param label: label to give to the ``BasisSet``, should not already exist.
+        :param description: description to give to the basis set.
+        :param parse_bases: callable without arguments that returns the list of unstored data nodes. It is only called
+            after verifying that the label does not already exist.
+        :raises ValueError: if a ``BasisSet`` already exists with the given name.
         """
         type_check(description, str, allow_none=True)
 
@@ -179,7 +307,7 @@ class BasisSet(Group):
         else:
             raise ValueError(f'the {cls.__name__} `{label}` already exists')
 
-        bases = cls.parse_bases_from_directory(dirpath, basis_type, deduplicate=deduplicate)
+        bases = parse_bases()
 
         # Only store the ``Group`` and the basis nodes now, such that we don't have to worry about the clean up in the
         # case that an exception is raised during creating them.
@@ -188,6 +316,55 @@ class BasisSet(Group):
 
         return basis_set
 
+    @classmethod
+    def create_from_folder(cls, dirpath, label, *, description='', basis_type=None, deduplicate=True):
+        """Create a new ``BasisSet`` from the bases contained in a directory.
+
+        :param dirpath: absolute path to the folder containing the UPF files.
+        :param label: label to give to the ``BasisSet``, should not already exist.
+        :param description: description to give to the basis set.
+        :param basis_type: subclass of ``BasisData`` to be used for the parsed bases. If not specified and
+            the basis set only defines a single supported basis type in ``_basis_types`` then that will be used,
+            otherwise a ``ValueError`` is raised.
+        :param deduplicate: if True, will scan database for existing bases of same type and with the same
+            md5 checksum, and use that instead of the parsed one. Files whose content is identical to that of a
+            preceding file are skipped with a ``UserWarning``, instead of being considered duplicate elements.
+        :raises ValueError: if a ``BasisSet`` already exists with the given name.
+        :raises ValueError: if ``dirpath`` is not a directory or contains anything other than files.
+        :raises ValueError: if ``dirpath`` contains multiple bases for the same element, except for files with identical
+            content if ``deduplicate`` is True.
+        :raises ValueError: if ``basis_type`` is explicitly specified and is not supported by this basis set class.
+        :raises ValueError: if ``basis_type`` is not specified and the class supports more than one basis type.
+        :raises ParsingError: if the constructor of the basis type fails for one of the files in the ``dirpath``.
+        """
+        return cls._create_from_bases(
+            label, description, lambda: cls.parse_bases_from_directory(dirpath, basis_type, deduplicate=deduplicate)
+        )
+
+    @classmethod
+    def create_from_streams(cls, streams, label, *, description='', basis_type=None, deduplicate=True):
+        """Create a new ``BasisSet`` from the bases provided as binary streams.
+
+        :param streams: iterable of tuples of the filename and a binary filelike object with the content of each file.
+        :param label: label to give to the ``BasisSet``, should not already exist.
+        :param description: description to give to the basis set.
+        :param basis_type: subclass of ``BasisData`` to be used for the parsed bases. If not specified and
+            the basis set only defines a single supported basis type in ``_basis_types`` then that will be used,
+            otherwise a ``ValueError`` is raised.
+        :param deduplicate: if True, will scan database for existing bases of same type and with the same
+            md5 checksum, and use that instead of the parsed one. Files whose content is identical to that of a
+            preceding file are skipped with a ``UserWarning``, instead of being considered duplicate elements.
+        :raises ValueError: if a ``BasisSet`` already exists with the given name.
+        :raises ValueError: if the streams contain multiple bases for the same element, except for streams with
+            identical content if ``deduplicate`` is True.
+        :raises ValueError: if ``basis_type`` is explicitly specified and is not supported by this basis set class.
+        :raises ValueError: if ``basis_type`` is not specified and the class supports more than one basis type.
+        :raises ParsingError: if the constructor of the basis type fails for one of the streams.
+        """
+        return cls._create_from_bases(
+            label, description, lambda: cls.parse_bases_from_streams(streams, basis_type, deduplicate=deduplicate)
+        )
+
     @property
     def basis_type(self):
         """Return the type of the bases that are hosted by this basis set.
@@ -196,13 +373,40 @@ class BasisSet(Group):
         """
         return self.get_extra(self._key_basis_type, None)
 
-    def update_basis_type(self):
-        """Update the basis type, stored as an extra, based on the current nodes in the basis set."""
-        basis_types = {basis.__class__ for basis in self.bases.values()}
+    @property
+    def archive_md5(self):
+        """Return the md5 checksum of the archive from which this basis set was created.
+
+        :return: the md5 checksum or ``None`` if the basis set was not created from an archive.
+        """
+        return self.get_extra(self._key_archive_md5, None)
+
+    @archive_md5.setter
+    def archive_md5(self, value: str):
+        """Set the md5 checksum of the archive from which this basis set was created.
+
+        :param value: the md5 checksum of the archive.
+        """
+        self.set_extra(self._key_archive_md5, value)
 
-        if basis_types:
-            assert len(basis_types) == 1, 'Basis set contains basis data nodes of various types.'
-            entry_point_name = tuple(basis_types)[0].get_entry_point_name()
+    def update_basis_type(self, basis_types=None):
+        """Update the basis type, stored as an extra, based on the current nodes in the basis set.
+
+        :param basis_types: optional set of the classes of nodes that were just added to the basis set. If specified,
+            the basis type is determined from these and the current basis type, instead of from all current nodes.
+        """
+        entry_point_names = set()
+
+        if basis_types is None:
+            basis_types = {basis.__class__ for basis in self.bases.values()}
+        elif self.basis_type is not None:
+            entry_point_names.add(self.basis_type)
+
+        entry_point_names.update(basis_type.get_entry_point_name() for basis_type in basis_types)
+
+        if entry_point_names:
+            assert len(entry_point_names) == 1, 'Basis set contains basis data nodes of various types.'
+            entry_point_name = entry_point_names.pop()
         else:
             entry_point_name = None
 
@@ -229,18 +433,21 @@ class BasisSet(Group):
             raise TypeError(f'only nodes of types `{self._basis_types}` can be added: {nodes}')
 
         bases = {}
+        existing = set(self.bases)
 
         # Check for duplicates before adding any basis to the internal cache
         for basis in nodes:
-            if basis.element in self.elements:
+            if basis.element in existing or basis.element in bases:
                 raise ValueError(f'element `{basis.element}` already present in this basis set')
             bases[basis.element] = basis
 
-        self.bases.update(bases)
-        self.update_basis_type()
-
+        self.update_basis_type({node.__class__ for node in nodes})
         super().add_nodes(nodes)
 
+        # Only update the cache once the nodes have actually been added, such that it is not left inconsistent if the
+        # basis type of the nodes is incompatible with that of the basis set.
+        self.bases.update(bases)
+
     def remove_nodes(self, nodes):
         """Remove a basis or a set of bases from the basis set.
 
@@ -251,14 +458,22 @@ class BasisSet(Group):
         if not isinstance(nodes, (list, tuple)):
             nodes = (nodes,)
 
-        removed = [node.pk for node in nodes]
-        self._bases = {basis.element: basis for basis in self.bases.values() if basis.pk not in removed}
-        self.update_basis_type()
+        # Each cached basis is indexed on its element, so the removed nodes can be looked up directly. If the cache has
+        # not been populated yet, it will reflect the removal once it is.
+        if self._bases is not None:
+            for node in nodes:
+                basis = self._bases.get(node.element)
+                if basis is not None and basis.pk == node.pk:
+                    del self._bases[node.element]
+
+        # All bases are of the same type, so removing some of them only changes the basis type if none are left.
+        if self.is_empty:
+            self.update_basis_type()
 
     def clear(self):
         """Remove all the bases from this basis set."""
         super().clear()
-        self._bases = None
+        self._bases = {}
         self.update_basis_type()
 
     @property
@@ -268,7 +483,10 @@ class BasisSet(Group):
         :return: dictionary of element symbol mapping bases
         """
         if self._bases is None:
-            self._bases = {basis.element: basis for basis in self.nodes}
+            builder = QueryBuilder()
+            builder.append(self.__class__, filters={'id': self.pk}, tag='group')
+            builder.append(self._basis_types, with_group='group', project=['attributes.element', '*'])
+            self._bases = dict(builder.iterall())
 
         return self._bases
 
@@ -287,25 +505,46 @@ class BasisSet(Group):
         :return: basis instance if it exists
         :raises ValueError: if the basis set does not contain a basis for the given element
         """
+        # All bases are loaded with a single query the first time that ``bases`` is accessed, so an element that is not
+        # in the cache is not part of this basis set and there is no need to query the database for it again.
         try:
-            basis = self.bases[element]
-        except KeyError:
+            return self.bases[element]
+        except KeyError as exception:
+            raise ValueError(f'basis set `{self.label}` does not contain basis for element `{element}`') from exception
+
+    def get_basis_pks(self, elements: Union[List[str], Tuple[str]]) -> Mapping[str, int]:  # pylint: disable=unsubscriptable-object
+        """Return the mapping of the given elements on the pks of the corresponding bases, without loading the nodes.
+
+        .. note:: if the bases of this basis set have already been loaded, their pks are returned without querying the
+            database. Otherwise only the elements and pks are projected, such that the nodes can be loaded on demand.
+
+        :param elements: list or tuple of element symbols.
+        :return: dictionary mapping the element symbols on the pks of the corresponding bases.
+        :raises ValueError: if the basis set does not contain a basis for any of the elements.
+        """
+        elements = set(elements)
+
+        if self._bases is not None:
+            pks = {element: basis.pk for element, basis in self._bases.items() if element in elements}
+        else:
             builder = QueryBuilder()
             builder.append(self.__class__, filters={'id': self.pk}, tag='group')
-            builder.append(self._basis_types, filters={'attributes.element': element}, with_group='group')
-
-            try:
-                basis = builder.one()[0]
-            except exceptions.MultipleObjectsError as exception:
-                raise RuntimeError(f'basis set `{self.label}` contains multiple bases for `{element}`') from exception
-            except exceptions.NotExistent as exception:
-                raise ValueError(
-                    f'basis set `{self.label}` does not contain basis for element `{element}`'
-                ) from exception
-            else:
-                self.bases[element] = basis
-
-        return basis
+            builder.append(
+                self._basis_types,
+                filters={'attributes.element': {'in': list(elements)}},
+                with_group='group',
+                project=['attributes.element', 'id']
+            )
+            pks = dict(builder.iterall())
+
+        missing = elements - pks.keys()
+
+        if missing:
+            raise ValueError(
+                f'basis set `{self.label}` does not contain basis for element(s) `{", ".join(sorted(missing))}`'
+            )
+
+        return pks
 
     def get_bases(
         self,
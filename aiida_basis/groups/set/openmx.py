@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Subclass of ``BasisSet`` designed to represent an OpenMX configuration."""
 import collections
-import json
+import functools
 import pathlib
 from typing import Sequence
 from importlib_resources import files
@@ -15,6 +15,8 @@ __all__ = ('OpenmxConfiguration', 'OpenmxBasisSet')
 
 OpenmxConfiguration = collections.namedtuple('OpenmxConfiguration', ['version', 'protocol', 'hardness'])
 
+_METADATA_ROOT = files(openmx_metadata)  # Resolved once, since every configuration has its metadata file here
+
 
 class OpenmxBasisSet(RecommendedOrbitalConfigurationMixin, BasisSet):
     """Subclass of ``BasisSet`` designed to represent a set of OpenMX PAOs.
@@ -36,6 +38,9 @@ class OpenmxBasisSet(RecommendedOrbitalConfigurationMixin, BasisSet):
         # FUTURE: add 2013 configurations
     )
 
+    # The labels are formatted once when the class is defined, such that validating a label is a set lookup.
+    _valid_labels = frozenset(map(label_template.format_map, map(OpenmxConfiguration._asdict, valid_configurations)))
+
     url_base = 'https://t-ozaki.issp.u-tokyo.ac.jp/'
     url_version = {'19': 'vps_pao2019/', '13': 'vps_pao2013/'}
 
@@ -45,8 +50,7 @@ class OpenmxBasisSet(RecommendedOrbitalConfigurationMixin, BasisSet):
 
         :return: valid configuration labels.
         """
-        configurations = set(cls.valid_configurations)
-        return tuple(cls.format_configuration_label(configuration) for configuration in configurations)
+        return tuple(cls._valid_labels)
 
     @classmethod
     def format_configuration_label(cls, configuration: OpenmxConfiguration) -> str:
@@ -67,19 +71,31 @@ class OpenmxBasisSet(RecommendedOrbitalConfigurationMixin, BasisSet):
         :return: metadata filepath.
         """
         metadata_filename = f'{configuration.version}_{configuration.protocol}_{configuration.hardness}.json'
-        return files(openmx_metadata) / metadata_filename
+        return _METADATA_ROOT / metadata_filename
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_configuration_metadata(cls, configuration: OpenmxConfiguration):
         """Return the metadata dictionary for an `OpenmxConfiguration`.
 
+        .. note:: the metadata file is only read once per configuration and the same dictionary is returned on each
+            subsequent call, so it should not be modified in place.
+
+        .. note:: if the optional ``orjson`` package is installed, it is used to decode the metadata instead of the
+            ``json`` module of the standard library.
+
         :param configuration: OpenMX basis set configuration.
         :returns: metadata dictionary.
         """
+        try:
+            from orjson import loads
+        except ImportError:
+            from json import loads
+
         metadata_filepath = cls.get_configuration_metadata_filepath(configuration)
         try:
-            with open(metadata_filepath, 'r') as stream:
-                metadata = json.load(stream)
+            with open(metadata_filepath, 'rb') as stream:
+                metadata = loads(stream.read())
         except FileNotFoundError as exception:
             raise FileNotFoundError(
                 f'Metadata JSON for {cls.format_configuration_label(configuration)} could not be found'
@@ -152,9 +168,13 @@ class OpenmxBasisSet(RecommendedOrbitalConfigurationMixin, BasisSet):
     #     return urls
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_md5s_configuration(cls, configuration: OpenmxConfiguration):
         """Return the MD5s for all the PAO files of a given OpenMX basis set configuration.
 
+        .. note:: the same dictionary is returned on each call for a given configuration, so it should not be modified
+            in place.
+
         :param configuration: OpenMX basis set configuration.
         :returns: dictionary of MD5s
         :raises: `ValueError` is the configuration is invalid.
@@ -169,9 +189,13 @@ class OpenmxBasisSet(RecommendedOrbitalConfigurationMixin, BasisSet):
         return md5s
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_orbital_configs_configuration(cls, configuration: OpenmxConfiguration):
         """Return the orbital configuration tuples for all the PAO files of a given OpenMX basis set configuration.
 
+        .. note:: the same dictionary is returned on each call for a given configuration, so it should not be modified
+            in place.
+
         :param configuration: OpenMX basis set configuration.
         :returns: dictionary of MD5s
         :raises: `ValueError` is the configuration is invalid.
@@ -189,7 +213,7 @@ class OpenmxBasisSet(RecommendedOrbitalConfigurationMixin, BasisSet):
 
     def __init__(self, label=None, **kwargs):
         """Construct a new instance, validating that the label matches the required format."""
-        if label not in self.get_valid_labels():
+        if label not in self._valid_labels:
             raise ValueError(f'the label `{label}` is not a valid OpenMX basis set configuration label.')
 
         super().__init__(label=label, **kwargs)
@@ -26,3 +26,15 @@ def test_basis_set_type_param_complete(ctx):
     assert isinstance(param.complete(ctx, ''), list)
     assert isinstance(param.complete(ctx, 'basis'), list)
     assert ('basis.set', '') in param.complete(ctx, 'basis')
+
+
+def test_archive_format_choice(ctx):
+    """Test the `ArchiveFormatChoice` parameter type."""
+    import shutil
+
+    param = types.ArchiveFormatChoice()
+    assert param.choices == [fmt[0] for fmt in shutil.get_archive_formats()]
+    assert param.convert('gztar', None, ctx) == 'gztar'
+
+    with pytest.raises(click.BadParameter):
+        param.convert('non-existing', None, ctx)
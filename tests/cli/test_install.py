@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""Tests for the :mod:`~aiida_basis.cli.install` module."""
+import hashlib
+import io
+import os
+import shutil
+
+import pytest
+
+from aiida.orm import load_group
+
+from aiida_basis.cli import install
+from aiida_basis.cli.params import types
+from aiida_basis.groups.set.openmx import OpenmxConfiguration
+
+
+class MockResponse:
+    """Mock of a streamed ``requests.Response``."""
+
+    def __init__(self, content):
+        self.raw = io.BytesIO(content)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def close(self):
+        """Do nothing, since there is no connection to release."""
+
+    def raise_for_status(self):
+        """Do nothing, since the request is always successful."""
+
+
+class MockSession:
+    """Mock of a ``requests.Session`` that serves the given content for each filename and records the requests."""
+
+    def __init__(self, contents):
+        self.contents = contents
+        self.requested = []
+
+    def get(self, url, stream=False):  # pylint: disable=unused-argument
+        """Return a response with the content of the file at the end of the URL."""
+        filename = url.rsplit('/', 1)[1]
+        self.requested.append(filename)
+        return MockResponse(self.contents[filename])
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    """Return a factory that replaces the session used by the ``install`` module with a ``MockSession``."""
+
+    def _mock_session(contents):
+        session = MockSession(contents)
+        monkeypatch.setattr(install, 'get_session', lambda: session)
+        monkeypatch.setattr(types, 'get_session', lambda: session)
+        return session
+
+    return _mock_session
+
+
+@pytest.fixture
+def metadata():
+    """Return the contents and the metadata of a dummy configuration."""
+    contents = {'Ar7.0.pao': b'argon', 'He7.0.pao': b'helium'}
+    metadata = {
+        filename.split('7')[0]: {
+            'filename': filename,
+            'md5': hashlib.md5(content).hexdigest()
+        } for filename, content in contents.items()
+    }
+    return contents, metadata
+
+
+def test_download_openmx(tmp_path, mock_session, metadata):
+    """Test that ``download_openmx`` only downloads the files that are missing or have an incorrect md5."""
+    contents, metadata = metadata
+    session = mock_session(contents)
+
+    (tmp_path / 'He7.0.pao').write_bytes(contents['He7.0.pao'])
+    (tmp_path / 'Ar7.0.pao').write_bytes(b'corrupted')
+    (tmp_path / 'other').write_bytes(b'other')
+
+    install.download_openmx(OpenmxConfiguration('19', 'standard', 'soft'), tmp_path, metadata)
+
+    assert session.requested == ['Ar7.0.pao']
+    assert (tmp_path / 'Ar7.0.pao').read_bytes() == contents['Ar7.0.pao']
+    assert (tmp_path / 'He7.0.pao').read_bytes() == contents['He7.0.pao']
+    assert (tmp_path / 'other').read_bytes() == b'other'
+
+    session.requested.clear()
+    install.download_openmx(OpenmxConfiguration('19', 'standard', 'soft'), tmp_path, metadata)
+    assert not session.requested
+
+
+def test_prune_download_cache(tmp_path):
+    """Test that ``prune_download_cache`` only removes regular files that are not among the given filenames."""
+    (tmp_path / 'Ar7.0.pao').write_bytes(b'argon')
+    (tmp_path / 'stale.pao').write_bytes(b'stale')
+    (tmp_path / 'directory').mkdir()
+
+    install.prune_download_cache(tmp_path, {'Ar7.0.pao'})
+
+    assert sorted(filepath.name for filepath in tmp_path.iterdir()) == ['Ar7.0.pao', 'directory']
+
+
+@pytest.mark.usefixtures('clear_db')
+@pytest.mark.parametrize('cache', (True, False))
+def test_install_openmx_cache(run_cli_command, monkeypatch, tmp_path, cache):
+    """Test that ``aiida-basis install openmx`` only uses and prunes the download cache if it is enabled."""
+    dirpath_cache = tmp_path / 'cache'
+    dirpaths = []
+
+    def download_openmx(configuration, dirpath, *args, **kwargs):  # pylint: disable=unused-argument
+        dirpaths.append(dirpath)
+
+    def create_basis_set_from_directory(*args, **kwargs):
+        raise RuntimeError('stop after downloading')
+
+    monkeypatch.setattr(install, 'get_download_cache_dirpath', lambda configuration: dirpath_cache)
+    monkeypatch.setattr(install, 'download_openmx', download_openmx)
+    monkeypatch.setattr(install, 'create_basis_set_from_directory', create_basis_set_from_directory)
+
+    if cache:
+        dirpath_cache.mkdir()
+        (dirpath_cache / 'stale.pao').write_bytes(b'stale')
+        (dirpath_cache / 'directory').mkdir()
+
+    options = [] if cache else ['--no-cache']
+    result = run_cli_command(install.cmd_install_openmx, options, raises=True)
+    assert 'stop after downloading' in result.output
+
+    if cache:
+        assert dirpaths == [dirpath_cache]
+        assert sorted(filepath.name for filepath in dirpath_cache.iterdir()) == ['directory']
+    else:
+        assert dirpaths[0] != dirpath_cache
+        assert not dirpaths[0].exists()
+        assert not dirpath_cache.exists()
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_install_basis_set_existing(run_cli_command, tmp_path, filepath_basis):
+    """Test that ``aiida-basis install basisset`` reuses a basis set installed from an identical archive as is."""
+    filepath_archive = shutil.make_archive(str(tmp_path / 'archive'), 'gztar', filepath_basis('pao'))
+    options = ['-B', 'basis.pao', filepath_archive, 'label']
+
+    result = run_cli_command(install.cmd_install_basis_set, options + ['-D', 'original'])
+    assert 'installed `label`' in result.output
+    assert load_group('label').description == 'original'
+
+    result = run_cli_command(install.cmd_install_basis_set, options + ['-D', 'changed'])
+    assert 'installed `label`' not in result.output
+    assert 'reusing the existing basis set' in result.output
+    assert load_group('label').description == 'original'
+
+
+@pytest.mark.usefixtures('clear_db')
+@pytest.mark.parametrize('fmt', ('zip', 'gztar'))
+def test_install_basis_set_url(run_cli_command, mock_session, tmp_path, filepath_basis, fmt):
+    """Test that ``aiida-basis install basisset`` installs an archive that is downloaded from a URL.
+
+    The downloaded archive is written to the same temporary file type as in production, which should support the
+    interface that both ``zipfile`` and ``tarfile`` require of a seekable stream.
+    """
+    filepath_archive = shutil.make_archive(str(tmp_path / 'archive'), fmt, filepath_basis('pao'))
+
+    with open(filepath_archive, 'rb') as handle:
+        filename = os.path.basename(filepath_archive)
+        session = mock_session({filename: handle.read()})
+
+    options = ['-B', 'basis.pao', f'https://localhost/{filename}', 'label']
+    result = run_cli_command(install.cmd_install_basis_set, options)
+
+    assert session.requested == [filename]
+    assert 'installed `label`' in result.output
+    elements = sorted(name.split('.')[0] for name in os.listdir(filepath_basis('pao')))
+    assert sorted(load_group('label').elements) == elements
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Tests for the :mod:`~aiida_basis.cli.utils` module."""
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+from aiida_basis.cli.utils import create_basis_set_from_archive, format_table, iter_archive_files
+from aiida_basis.data.basis import PaoData
+from aiida_basis.groups.set import BasisSet
+
+
+@pytest.mark.parametrize('fmt', ('zip', 'tar', 'gztar', 'bztar', 'xztar'))
+@pytest.mark.parametrize('explicit', (True, False))
+def test_iter_archive_files(tmpdir, filepath_basis, fmt, explicit):
+    """Test the ``iter_archive_files`` function for all supported formats, with and without explicit format."""
+    filepath_archive = shutil.make_archive(str(tmpdir / 'archive'), fmt, filepath_basis('pao'))
+
+    with open(filepath_archive, 'rb') as handle:
+        stream = io.BytesIO(handle.read())
+
+    for archive in (filepath_archive, stream):
+        files = dict(iter_archive_files(archive, fmt=fmt if explicit else None))
+        assert sorted(files) == sorted(os.listdir(filepath_basis('pao')))
+
+        for filename, content in files.items():
+            with open(os.path.join(filepath_basis('pao'), filename), 'rb') as handle:
+                assert content.read() == handle.read()
+
+
+@pytest.mark.parametrize('fmt', ('zip', 'gztar'))
+@pytest.mark.parametrize('backend', ('libarchive', 'stdlib'))
+def test_iter_archive_files_temporary_file(monkeypatch, tmpdir, filepath_basis, fmt, backend):
+    """Test the ``iter_archive_files`` function for a temporary file, as used for archives downloaded from a URL.
+
+    Both the optional ``libarchive`` backend and the fallback on the standard library are tested.
+    """
+    if backend == 'libarchive':
+        pytest.importorskip('libarchive')
+    else:
+        # Setting the module to ``None`` causes its import to raise an ``ImportError``.
+        monkeypatch.setitem(sys.modules, 'libarchive', None)
+
+    filepath_archive = shutil.make_archive(str(tmpdir / 'archive'), fmt, filepath_basis('pao'))
+
+    with tempfile.TemporaryFile(mode='w+b') as stream:
+        with open(filepath_archive, 'rb') as handle:
+            shutil.copyfileobj(handle, stream)
+
+        files = dict(iter_archive_files(stream))
+
+    assert sorted(files) == sorted(os.listdir(filepath_basis('pao')))
+
+
+def test_iter_archive_files_invalid(tmpdir):
+    """Test the ``iter_archive_files`` function for invalid archives and formats."""
+    with pytest.raises(shutil.ReadError):
+        list(iter_archive_files(io.BytesIO(b'invalid')))
+
+    with pytest.raises(ValueError, match=r'unknown archive format `.*`'):
+        list(iter_archive_files(io.BytesIO(b'invalid'), fmt='rar'))
+
+    dirpath = tmpdir.mkdir('content')
+    dirpath.mkdir('a').join('file').write('content')
+    dirpath.mkdir('b').join('file').write('content')
+
+    filepath_archive = shutil.make_archive(str(tmpdir / 'archive'), 'gztar', str(dirpath))
+
+    with pytest.raises(ValueError, match=r'the archive should only contain files'):
+        list(iter_archive_files(filepath_archive))
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_create_basis_set_from_archive_existing(tmpdir, filepath_basis):
+    """Test that ``create_basis_set_from_archive`` returns the existing basis set for an archive installed before."""
+    filepath_archive = shutil.make_archive(str(tmpdir / 'archive'), 'gztar', filepath_basis('pao'))
+
+    basis_set = create_basis_set_from_archive(BasisSet, 'label', filepath_archive, basis_type=PaoData)
+    assert basis_set.archive_md5 is not None
+
+    with open(filepath_archive, 'rb') as handle:
+        existing = create_basis_set_from_archive(BasisSet, 'label', io.BytesIO(handle.read()), basis_type=PaoData)
+
+    assert existing.pk == basis_set.pk
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_create_basis_set_from_archive_directory(filepath_basis):
+    """Test that ``create_basis_set_from_archive`` creates the basis set directly from a directory."""
+    basis_set = create_basis_set_from_archive(BasisSet, 'label', filepath_basis('pao'), basis_type=PaoData)
+    assert basis_set.count() == len(os.listdir(filepath_basis('pao')))
+    assert basis_set.archive_md5 is None
+
+
+def test_format_table():
+    """Test the ``format_table`` function."""
+    rows = [['Ar', 'Ar.pao', 1], ['He', 'He.pao', 10]]
+
+    assert format_table([]) == ''
+    assert format_table(iter(rows)) == 'Ar  Ar.pao  1\nHe  He.pao  10'
+    assert format_table(rows, headers=['Element', 'Basis', 'Value']) == (
+        'Element  Basis   Value\n'
+        '-------  ------  -----\n'
+        'Ar       Ar.pao  1\n'
+        'He       He.pao  10'
+    )
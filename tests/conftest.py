@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=redefined-outer-name,unused-argument
 """Configuration and fixtures for unit test suite."""
+import functools
 import io
 import os
+import pathlib
+import traceback
 
 import click
+from click.testing import CliRunner
 import pytest
 
 from aiida.plugins import DataFactory
@@ -13,25 +17,58 @@ from aiida_basis.data.basis import BasisData
 
 pytest_plugins = ['aiida.manage.tests.pytest_fixtures']  # pylint: disable=invalid-name
 
+# Absolute filepath of the directory with the fixture files, which test modules can use at collection time.
+FILEPATH_FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@functools.lru_cache(maxsize=None)
+def _read_fixture_bytes(filepath: str) -> bytes:
+    """Return the content of a fixture file, which is only read from disk the first time it is requested.
+
+    :param filepath: absolute filepath of the fixture file.
+    :return: the content of the file.
+    """
+    return pathlib.Path(filepath).read_bytes()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_basis_class(entry_point: str = None):
+    """Return the ``BasisData`` subclass for the given entry point, which is only loaded the first time it is requested.
+
+    :param entry_point: the entry point name without the ``basis.`` prefix, or ``None`` for the base class.
+    :return: the ``BasisData`` subclass.
+    """
+    return DataFactory('basis' if entry_point is None else f'basis.{entry_point}')
+
 
 @pytest.fixture
 def clear_db(clear_database_before_test):
-    """Alias for the `clear_database_before_test` fixture from `aiida-core`."""
+    """Alias for the `clear_database_before_test` fixture from `aiida-core`.
+
+    Only use this fixture for tests that store nodes or query the database. Tests that merely construct unstored nodes
+    should use the session-scoped `aiida_profile` fixture instead, which loads the profile without clearing it.
+    """
     yield
 
 
 @pytest.fixture
 def ctx():
-    """Return an empty `click.Context` instance."""
+    """Return an empty `click.Context` instance.
+
+    A new context is created for each test, such that state set on it, for example on ``ctx.obj`` or ``ctx.meta``, does
+    not leak into other tests. Creating it is cheap, since it does not require loading a profile.
+    """
     return click.Context(click.Command(name='dummy'))
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def run_cli_command():
     """Run a `click` command with the given options.
 
-    The call will raise if the command triggered an exception or the exit code returned is non-zero.
+    The call will raise if the command triggered an exception or the exit code returned is non-zero. A single runner is
+    shared by all invocations, which is safe since it does not keep any state between them.
     """
+    runner = CliRunner()
 
     def _run_cli_command(command, options=None, raises=None):
         """Run the command and check the result.
@@ -40,10 +77,6 @@ def run_cli_command():
         :param options: the list of command line options to pass to the command invocation
         :param raises: optionally an exception class that is expected to be raised
         """
-        import traceback
-        from click.testing import CliRunner
-
-        runner = CliRunner()
         result = runner.invoke(command, options or [])
 
         if raises is not None:
@@ -60,16 +93,16 @@ def run_cli_command():
     return _run_cli_command
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def filepath_fixtures() -> str:
     """Return the absolute filepath to the directory containing the file `fixtures`.
 
     :return: absolute filepath to directory containing test fixture data.
     """
-    return os.path.join(os.path.dirname(__file__), 'fixtures')
+    return FILEPATH_FIXTURES
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def filepath_basis(filepath_fixtures):
     """Return the absolute filepath to the directory containing the basisfiles.
 
@@ -87,6 +120,34 @@ def filepath_basis(filepath_fixtures):
     return _filepath_basis
 
 
+@pytest.fixture(scope='session')
+def basis_files(filepath_fixtures):
+    """Return the filepaths of all basis fixture files, which are discovered once for the entire session.
+
+    :return: dictionary mapping each entry point on a dictionary of the filenames and absolute filepaths of its files.
+    """
+    with os.scandir(os.path.join(filepath_fixtures, 'basis')) as iterator:
+        dirpaths = [entry for entry in iterator if entry.is_dir()]
+
+    files = {}
+
+    for dirpath in dirpaths:
+        with os.scandir(dirpath.path) as iterator:
+            files[dirpath.name] = {entry.name: entry.path for entry in iterator}
+
+    return files
+
+
+@pytest.fixture(scope='session')
+def read_fixture_bytes():
+    """Return a function that returns the content of a fixture file, which is cached for the entire session.
+
+    The content is returned as ``bytes``, which are immutable, so tests should wrap it in a new ``io.BytesIO`` if they
+    need a stream.
+    """
+    return _read_fixture_bytes
+
+
 @pytest.fixture
 def get_basis_data(filepath_basis):
     """Return a factory for `BasisData` nodes."""
@@ -97,80 +158,16 @@ def get_basis_data(filepath_basis):
         :param element: one of the elements for which there is a PAO test file available.
         :return: the `BasisData`
         """
+        cls = _get_basis_class(entry_point)
+
         if entry_point is None:
-            cls = DataFactory('basis')
             basis = cls(io.BytesIO(b'content'), f'{element}.basis')
             basis.element = element
         else:
-            cls = DataFactory(f'basis.{entry_point}')
             filename = f'{element}.{entry_point}'
-            with open(os.path.join(filepath_basis(entry_point), filename), 'rb') as handle:
-                basis = cls(handle, filename)
+            content = _read_fixture_bytes(os.path.join(filepath_basis(entry_point), filename))
+            basis = cls(io.BytesIO(content), filename)
 
         return basis
 
     return _get_basis_data
-
-
-# @pytest.fixture
-# def get_pseudo_family(tmpdir, filepath_basis):
-#     """Return a factory for a `PseudoPotentialFamily` instance."""
-
-#     def _get_pseudo_family(
-#         label='family',
-#         cls=PseudoPotentialFamily,
-#         pseudo_type=PseudoPotentialData,
-#         elements=None
-#     ) -> PseudoPotentialFamily:
-#         """Return an instance of `PseudoPotentialFamily` or subclass containing the given elements.
-
-#         :param elements: optional list of elements to include instead of all the available ones
-#         :return: the pseudo family
-#         """
-#         if elements is not None:
-#             elements = {re.sub('[0-9]+', '', element) for element in elements}
-
-#         if pseudo_type is PseudoPotentialData:
-#             # There is no actual pseudopotential file fixtures for the base class, so default back to `.upf` files
-#             extension = 'upf'
-#         else:
-#             extension = pseudo_type.get_entry_point_name()[len('pseudo.'):]
-
-#         dirpath = filepath_basis(extension)
-
-#         for pseudo in os.listdir(dirpath):
-#             if elements is None or any([pseudo.startswith(element) for element in elements]):
-#                 shutil.copyfile(os.path.join(dirpath, pseudo), os.path.join(str(tmpdir), pseudo))
-
-#         return cls.create_from_folder(str(tmpdir), label, pseudo_type=pseudo_type)
-
-#     return _get_pseudo_family
-
-# @pytest.fixture
-# def get_pseudo_archive(tmpdir, filepath_basis):
-#     """Create an archive with pseudos."""
-
-#     def _get_pseudo_archive(fmt='gztar'):
-#         shutil.make_archive(str(tmpdir / 'archive'), fmt, filepath_basis('upf'))
-#         filepath = os.path.join(str(tmpdir), os.listdir(str(tmpdir))[0])
-#         yield filepath
-
-#     return _get_pseudo_archive
-
-# @pytest.fixture
-# def generate_structure():
-#     """Return a ``StructureData``."""
-
-#     def _generate_structure(elements=('Ar',)):
-#         """Return a ``StructureData``."""
-#         from aiida.orm import StructureData
-
-#         structure = StructureData(cell=[[1, 0, 0], [0, 1, 0], [0, 0, 1]])
-
-#         for index, element in enumerate(elements):
-#             symbol = re.sub(r'[0-9]+', '', element)
-#             structure.append_atom(position=(index * 0.5, index * 0.5, index * 0.5), symbols=symbol, name=element)
-
-#         return structure
-
-#     return _generate_structure
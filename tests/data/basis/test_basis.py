@@ -1,28 +1,38 @@
 # -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
 """Tests for the :py:mod:`~aiida_basis.data.basis.basis` module."""
+import hashlib
 import io
+import os
 
 import pytest
 
-from aiida.common.files import md5_from_filelike
 from aiida.common.exceptions import ModificationNotAllowed, StoringNotAllowed
 from aiida.common.links import LinkType
 from aiida.orm import CalcJobNode
 
 from aiida_basis.data.basis import BasisData, PaoData
+from aiida_basis.data.basis.basis import md5_from_file, md5_from_filelike
 
 
-@pytest.mark.usefixtures('clear_db')
-def test_constructor():
+@pytest.fixture(scope='module')
+def basis_payload():
+    """Return a tuple of the content of a dummy basis file and its md5 checksum, which are computed only once."""
+    content = b'basis'
+    return content, hashlib.md5(content).hexdigest()
+
+
+@pytest.mark.usefixtures('aiida_profile')
+def test_constructor(basis_payload):
     """Test the constructor."""
-    stream = io.BytesIO(b'basis')
+    content, _ = basis_payload
 
-    basis = BasisData(stream)
+    basis = BasisData(io.BytesIO(content))
     assert isinstance(basis, BasisData)
     assert not basis.is_stored
 
 
-@pytest.mark.usefixtures('clear_db')
+@pytest.mark.usefixtures('aiida_profile')
 def test_constructor_invalid():
     """Test the constructor for invalid arguments."""
     with pytest.raises(TypeError, match='missing 1 required positional argument'):
@@ -30,14 +40,12 @@ def test_constructor_invalid():
 
 
 @pytest.mark.usefixtures('clear_db')
-def test_store():
+def test_store(basis_payload):
     """Test the `BasisData.store` method."""
-    stream = io.BytesIO(b'basis')
-    md5_correct = md5_from_filelike(stream)
+    content, md5_correct = basis_payload
     md5_incorrect = 'abcdef0123456789'
-    stream.seek(0)
 
-    basis = BasisData(io.BytesIO(b'basis'))
+    basis = BasisData(io.BytesIO(content))
 
     with pytest.raises(StoringNotAllowed, match='no valid element has been defined.'):
         basis.store()
@@ -55,10 +63,11 @@ def test_store():
 
 
 @pytest.mark.usefixtures('clear_db')
-def test_element():
+def test_element(basis_payload):
     """Test the `BasisData.element` property."""
+    content, _ = basis_payload
     element = 'Ar'
-    basis = BasisData(io.BytesIO(b'basis'))
+    basis = BasisData(io.BytesIO(content))
     assert basis.element is None
 
     element = 'He'
@@ -75,13 +84,11 @@ def test_element():
 
 
 @pytest.mark.usefixtures('clear_db')
-def test_md5():
+def test_md5(basis_payload):
     """Test the `BasisData.md5` property."""
-    stream = io.BytesIO(b'basis')
-    md5 = md5_from_filelike(stream)
-    stream.seek(0)
+    content, md5 = basis_payload
 
-    basis = BasisData(stream)
+    basis = BasisData(io.BytesIO(content))
     basis.element = 'Ar'
     assert basis.md5 == md5
 
@@ -95,9 +102,10 @@ def test_md5():
 
 
 @pytest.mark.usefixtures('clear_db')
-def test_store_indirect():
+def test_store_indirect(basis_payload):
     """Test the `BasisData.store` method when called indirectly because its is an input."""
-    basis = BasisData(io.BytesIO(b'basis'))
+    content, _ = basis_payload
+    basis = BasisData(io.BytesIO(content))
     basis.element = 'Ar'
 
     node = CalcJobNode()
@@ -140,3 +148,35 @@ def test_get_or_create(get_basis_data):
     assert isinstance(different_class, BasisData)
     assert not different_class.is_stored
     assert different_class.uuid != original.uuid
+
+
+@pytest.mark.parametrize('stream_type', ('bytesio', 'file'))
+def test_md5_from_filelike_position(tmp_path, stream_type):
+    """Test that ``md5_from_filelike`` hashes the content from the current position of the stream onwards."""
+    content = b'abcdef'
+
+    if stream_type == 'bytesio':
+        stream = io.BytesIO(content)
+    else:
+        filepath = tmp_path / 'basis'
+        filepath.write_bytes(content)
+        stream = open(filepath, 'rb')  # pylint: disable=consider-using-with
+
+    with stream:
+        stream.seek(3)
+        assert md5_from_filelike(stream) == hashlib.md5(content[3:]).hexdigest()
+        assert stream.tell() == len(content)
+
+
+@pytest.mark.skipif(not os.path.isfile('/proc/self/maps'), reason='requires `/proc/self/maps` to list memory maps')
+@pytest.mark.parametrize('content', (b'', b'basis' * 4096))
+def test_md5_from_file(tmp_path, content):
+    """Test that ``md5_from_file`` hashes the entire file and releases its memory map before returning."""
+    filepath = tmp_path / 'basis'
+    filepath.write_bytes(content)
+
+    with open(filepath, 'rb') as handle:
+        assert md5_from_file(handle) == hashlib.md5(content).hexdigest()
+
+        with open('/proc/self/maps') as maps:
+            assert str(filepath) not in maps.read()
@@ -8,14 +8,26 @@ import pathlib
 import pytest
 
 from aiida.common.exceptions import ModificationNotAllowed
+from aiida.orm import load_node
 from aiida_basis.data.basis import PaoData
-from aiida_basis.data.basis.pao import parse_z_valence
+from aiida_basis.data.basis import pao
+from aiida_basis.data.basis.pao import parse_header, parse_header_from_stream, parse_z_valence
+from tests.conftest import FILEPATH_FIXTURES
+
+# The fixture files are listed when the module is collected, such that each file is tested separately.
+FILENAMES_PAO = sorted(os.listdir(os.path.join(FILEPATH_FIXTURES, 'basis', 'pao')))
+
+
+@pytest.fixture(scope='session')
+def filepath_ar_pao(basis_files):
+    """Return the absolute filepath of the ``Ar.pao`` fixture file."""
+    return pathlib.Path(basis_files['pao']['Ar.pao'])
 
 
 @pytest.fixture
-def source(request, filepath_basis):
-    """Return a basis, eiter as ``str``, ``Path`` or ``io.BytesIO``."""
-    filepath = pathlib.Path(filepath_basis(entry_point='pao')) / 'Ar.pao'
+def source(request, filepath_ar_pao, read_fixture_bytes):
+    """Return a basis, eiter as ``str``, ``Path``, ``io.BufferedReader`` or ``io.BytesIO``."""
+    filepath = filepath_ar_pao
 
     if request.param is str:
         return str(filepath)
@@ -23,10 +35,19 @@ def source(request, filepath_basis):
     if request.param is pathlib.Path:
         return filepath
 
-    return io.BytesIO(filepath.read_bytes())
+    if request.param is io.BufferedReader:
+        handle = open(filepath, 'rb')  # pylint: disable=consider-using-with
+        request.addfinalizer(handle.close)
+        return handle
+
+    return io.BytesIO(read_fixture_bytes(str(filepath)))
 
 
-@pytest.mark.parametrize('source', (io.BytesIO, str, pathlib.Path), indirect=True)
+@pytest.mark.parametrize(
+    'source', (io.BytesIO, io.BufferedReader, str, pathlib.Path),
+    indirect=True,
+    ids=['bytesio', 'bufferedreader', 'str', 'path']
+)
 def test_constructor_source_types(source):
     """Test the constructor accept the various types."""
     basis = PaoData(source)
@@ -34,18 +55,18 @@ def test_constructor_source_types(source):
     assert not basis.is_stored
 
 
-def test_constructor(filepath_basis):
+@pytest.mark.parametrize('filename', FILENAMES_PAO)
+def test_constructor(basis_files, read_fixture_bytes, filename):
     """Test the constructor."""
-    for filename in os.listdir(filepath_basis('pao')):
-        with open(os.path.join(filepath_basis('pao'), filename), 'rb') as handle:
-            basis = PaoData(handle, filename=filename)
-            assert isinstance(basis, PaoData)
-            assert not basis.is_stored
-            assert basis.element == filename.split('.')[0]
+    content = read_fixture_bytes(basis_files['pao'][filename])
+    basis = PaoData(io.BytesIO(content), filename=filename)
+    assert isinstance(basis, PaoData)
+    assert not basis.is_stored
+    assert basis.element == filename.split('.')[0]
 
 
 @pytest.mark.usefixtures('clear_db')
-def test_set_file(filepath_basis, get_basis_data):
+def test_set_file(basis_files, get_basis_data, read_fixture_bytes):
     """Test the `PaoData.set_file` method.
 
     This method allows to change the file, as long as the node has not been stored yet. We need to verify that all the
@@ -54,26 +75,51 @@ def test_set_file(filepath_basis, get_basis_data):
     basis = get_basis_data(element='Ar', entry_point='pao')
     assert basis.element == 'Ar'
 
-    with open(os.path.join(filepath_basis('pao'), 'He.pao'), 'rb') as handle:
-        basis.set_file(handle)
-        assert basis.element == 'He'
+    content = read_fixture_bytes(basis_files['pao']['He.pao'])
 
-        basis.store()
-        assert basis.element == 'He'
+    basis.set_file(io.BytesIO(content), 'He.pao')
+    assert basis.element == 'He'
 
-        with pytest.raises(ModificationNotAllowed):
-            basis.set_file(handle)
+    basis.store()
+    assert basis.element == 'He'
+
+    with pytest.raises(ModificationNotAllowed):
+        basis.set_file(io.BytesIO(content), 'He.pao')
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_max_l(filepath_ar_pao):
+    """Test that the ``max_l`` parsed by ``PaoData.set_file`` is stored as an attribute and round-trips."""
+    basis = PaoData(filepath_ar_pao)
+    assert basis.max_l == 3
+
+    basis.store()
+    assert load_node(basis.pk).max_l == 3
 
 
 @pytest.mark.parametrize(
-    'content', (
-        'valence.electron 8.0', 'Valence.Electron  8.000', 'VALENCE.ELECTRON 8.0', 'valence.electron 8.0e1',
-        'valence.electron 8.000E01'
+    'content, expected', (
+        ('valence.electron 8.0', 8),
+        ('Valence.Electron  8.000', 8),
+        ('VALENCE.ELECTRON 8.0', 8),
+        ('valence.electron 8.0e1', 80),
+        ('valence.electron 8.000E01', 80),
+        ('atomspecies 18\n  valence.electron 8.0', 8),
     )
 )
-def test_parse_z_valence(content):
+def test_parse_z_valence(content, expected):
     """Test the ``parse_z_valence`` method."""
-    assert parse_z_valence(content)
+    assert parse_z_valence(content) == expected
 
 
 # FUTURE: test other PaoData-related functions
+
+
+@pytest.mark.parametrize('chunk_size', (1, 7, 4096))
+@pytest.mark.parametrize('filename', FILENAMES_PAO)
+def test_parse_header_from_stream(monkeypatch, basis_files, read_fixture_bytes, filename, chunk_size):
+    """Test that ``parse_header_from_stream`` finds the same values as ``parse_header`` for any chunk size."""
+    content = read_fixture_bytes(basis_files['pao'][filename])
+    monkeypatch.setattr(pao, 'HEADER_CHUNK_SIZE', chunk_size)
+
+    assert parse_header_from_stream(io.BytesIO(content)) == parse_header(content.decode('utf-8'))
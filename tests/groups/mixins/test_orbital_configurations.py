@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Tests for the :py:mod:`~aiida_basis.groups.mixins.orbital_configurations` module."""
+import pytest
+
+from aiida_basis.groups.mixins import OrbitalConfiguration, RecommendedOrbitalConfigurationMixin
+
+
+def test_validate_orbital_configurations():
+    """Test the ``RecommendedOrbitalConfigurationMixin.validate_orbital_configurations`` method."""
+    validate = RecommendedOrbitalConfigurationMixin.validate_orbital_configurations
+
+    validate({'Ar', 'He'}, {'Ar': (2, 2, 1, 0), 'He': [2, 1, 0, 0]})
+    validate({'Ar'}, {'Ar': OrbitalConfiguration(s=2, p=2, d=1, f=0)})
+
+    with pytest.raises(ValueError, match=r'orbital configurations defined for unsupported elements: .*'):
+        validate({'Ar'}, {'Ar': (2, 2, 1, 0), 'He': (2, 1, 0, 0)})
+
+    with pytest.raises(ValueError, match=r'orbital configurations not defined for all family elements: .*'):
+        validate({'Ar', 'He'}, {'Ar': (2, 2, 1, 0)})
+
+    with pytest.raises(ValueError, match=r'orbital configurations defined for unsupported elements: .*'):
+        validate({'Ar', 'He'}, {'Ar': (2, 2, 1, 0), 'Ne': (2, 2, 1, 0)})
+
+    with pytest.raises(ValueError, match=r'invalid length of orbital configuration for element Ar: .*'):
+        validate({'Ar'}, {'Ar': (2, 2, 1)})
+
+    with pytest.raises(ValueError, match=r'invalid orbital configuration values for element Ar: .*'):
+        validate({'Ar'}, {'Ar': (2, 2, 1, 0.5)})
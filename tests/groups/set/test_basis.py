@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+"""Tests for the :py:mod:`~aiida_basis.groups.set.basis` module."""
+import io
+import os
+import shutil
+
+import pytest
+
+from aiida.orm import load_group
+
+from aiida_basis.data.basis import BasisData, PaoData
+from aiida_basis.groups.set import BasisSet
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_parse_bases_from_directory_identical(tmp_path, basis_files):
+    """Test that files with identical content are skipped with a warning, but only when deduplicating."""
+    shutil.copyfile(basis_files['pao']['Ar.pao'], tmp_path / 'Ar.pao')
+    shutil.copyfile(basis_files['pao']['Ar.pao'], tmp_path / 'Ar_copy.pao')
+    shutil.copyfile(basis_files['pao']['He.pao'], tmp_path / 'He.pao')
+
+    with pytest.warns(UserWarning, match=r'skipping `Ar_copy.pao` since its content is identical to that of `Ar.pao`'):
+        bases = BasisSet.parse_bases_from_directory(tmp_path, basis_type=PaoData)
+
+    assert sorted(basis.element for basis in bases) == ['Ar', 'He']
+    assert sorted(basis.filename for basis in bases) == ['Ar.pao', 'He.pao']
+
+    with pytest.raises(ValueError, match=r'contains bases with duplicate elements'):
+        BasisSet.parse_bases_from_directory(tmp_path, basis_type=PaoData, deduplicate=False)
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_create_from_streams_identical(basis_files, read_fixture_bytes):
+    """Test that ``create_from_streams`` only adds one basis for streams with identical content."""
+    content = read_fixture_bytes(basis_files['pao']['Ar.pao'])
+    streams = [('Ar.pao', io.BytesIO(content)), ('Ar_copy.pao', io.BytesIO(content))]
+
+    with pytest.warns(UserWarning, match=r'skipping `Ar_copy.pao`'):
+        basis_set = BasisSet.create_from_streams(streams, 'label', basis_type=PaoData)
+
+    assert basis_set.count() == 1
+    assert basis_set.elements == ['Ar']
+
+
+@pytest.mark.usefixtures('aiida_profile')
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason='requires `/proc/self/fd` to count open files')
+def test_parse_bases_from_directory_invalid_entry(tmp_path, basis_files):
+    """Test that no files remain open if ``parse_bases_from_directory`` fails because of an entry that is not a file."""
+    for filename in ('Ar.pao', 'He.pao', 'Ne.pao'):
+        shutil.copyfile(basis_files['pao'][filename], tmp_path / filename)
+
+    (tmp_path / 'directory').mkdir()
+    number_of_open_files = len(os.listdir('/proc/self/fd'))
+
+    with pytest.raises(ValueError, match=r'contains at least one entry that is not a file'):
+        BasisSet.parse_bases_from_directory(tmp_path, basis_type=PaoData)
+
+    assert len(os.listdir('/proc/self/fd')) == number_of_open_files
+
+
+@pytest.mark.usefixtures('clear_db')
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason='requires `/proc/self/fd` to count open files')
+def test_parse_bases_from_directory_open_files(tmp_path, basis_files):
+    """Test that ``parse_bases_from_directory`` does not keep all files open, which could exceed the limit of the OS."""
+    resource = pytest.importorskip('resource')
+    number_of_files = 256
+
+    for index in range(number_of_files):
+        shutil.copyfile(basis_files['pao']['Ar.pao'], tmp_path / f'Ar{index:03d}.pao')
+
+    # Leave room for the files opened concurrently by the workers, but not for all the files in the directory.
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (len(os.listdir('/proc/self/fd')) + number_of_files // 2, hard))
+
+    try:
+        with pytest.warns(UserWarning, match=r'since its content is identical to that of `Ar000.pao`'):
+            bases = BasisSet.parse_bases_from_directory(tmp_path, basis_type=PaoData)
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+    assert [basis.filename for basis in bases] == ['Ar000.pao']
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_create_from_streams_existing(filepath_basis, basis_files, read_fixture_bytes):
+    """Test that ``create_from_streams`` reuses the stored bases with the same content instead of creating new ones."""
+    original = BasisSet.create_from_folder(filepath_basis('pao'), 'original', basis_type=PaoData)
+
+    streams = [(name, io.BytesIO(read_fixture_bytes(filepath))) for name, filepath in basis_files['pao'].items()]
+    basis_set = BasisSet.create_from_streams(streams, 'label', basis_type=PaoData)
+
+    assert {element: basis.pk for element, basis in basis_set.bases.items()} == {
+        element: basis.pk for element, basis in original.bases.items()
+    }
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_bases(filepath_basis):
+    """Test the ``BasisSet.bases`` property loads all the bases of a basis set that was loaded from the database."""
+    basis_set = BasisSet.create_from_folder(filepath_basis('pao'), 'label', basis_type=PaoData)
+    uuids = {element: basis.uuid for element, basis in basis_set.bases.items()}
+
+    loaded = load_group(basis_set.pk)
+    assert loaded._bases is None
+
+    bases = loaded.bases
+    assert all(isinstance(basis, PaoData) for basis in bases.values())
+    assert {element: basis.uuid for element, basis in bases.items()} == uuids
+    assert sorted(loaded.elements) == sorted(uuids)
+    assert loaded.bases is bases
+
+
+@pytest.mark.usefixtures('clear_db')
+@pytest.mark.parametrize('cached', (True, False))
+def test_get_basis_pks(filepath_basis, cached):
+    """Test ``BasisSet.get_basis_pks`` both if the bases have already been loaded and if they have not."""
+    basis_set = BasisSet.create_from_folder(filepath_basis('pao'), 'label', basis_type=PaoData)
+    pks = {element: basis.pk for element, basis in basis_set.bases.items()}
+
+    if not cached:
+        basis_set = load_group(basis_set.pk)
+
+    assert basis_set.get_basis_pks(['Ar', 'He']) == {'Ar': pks['Ar'], 'He': pks['He']}
+    assert basis_set.get_basis_pks(('Ar',)) == {'Ar': pks['Ar']}
+
+    with pytest.raises(ValueError, match=r'does not contain basis for element\(s\) `Au, Xe`'):
+        basis_set.get_basis_pks(['Ar', 'Xe', 'Au'])
+
+    # Projecting the pks should not load the bases if they were not already loaded.
+    assert (basis_set._bases is None) is not cached
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_add_nodes_duplicate(get_basis_data):
+    """Test that ``BasisSet.add_nodes`` refuses duplicate elements, both within the nodes and with existing bases."""
+    basis_set = BasisSet(label='label').store()
+    argon = get_basis_data(element='Ar', entry_point='pao').store()
+    duplicate = get_basis_data(element='Ar', entry_point='pao').store()
+
+    with pytest.raises(ValueError, match=r'element `Ar` already present in this basis set'):
+        basis_set.add_nodes([argon, duplicate])
+
+    assert basis_set.is_empty
+    assert basis_set.bases == {}
+
+    basis_set.add_nodes(argon)
+
+    with pytest.raises(ValueError, match=r'element `Ar` already present in this basis set'):
+        basis_set.add_nodes(duplicate)
+
+    assert basis_set.count() == 1
+    assert basis_set.bases == {'Ar': argon}
+
+
+@pytest.mark.usefixtures('clear_db')
+@pytest.mark.parametrize('cached', (True, False))
+def test_remove_nodes(filepath_basis, cached):
+    """Test that ``BasisSet.remove_nodes`` updates the cached bases and only resets the basis type once empty."""
+    basis_set = BasisSet.create_from_folder(filepath_basis('pao'), 'label', basis_type=PaoData)
+    bases = dict(basis_set.bases)
+
+    if not cached:
+        basis_set = load_group(basis_set.pk)
+
+    basis_set.remove_nodes(bases.pop('Ar'))
+
+    assert 'Ar' not in basis_set.bases
+    assert sorted(basis_set.elements) == sorted(bases)
+    assert basis_set.basis_type == 'basis.pao'
+
+    basis_set.remove_nodes(list(bases.values()))
+
+    assert basis_set.bases == {}
+    assert basis_set.basis_type is None
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_clear(filepath_basis):
+    """Test that ``BasisSet.clear`` empties the cached bases and resets the basis type."""
+    basis_set = BasisSet.create_from_folder(filepath_basis('pao'), 'label', basis_type=PaoData)
+    assert basis_set.basis_type == 'basis.pao'
+
+    basis_set.clear()
+
+    assert basis_set.is_empty
+    assert basis_set.bases == {}
+    assert basis_set.basis_type is None
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_update_basis_type(get_basis_data):
+    """Test that ``BasisSet.update_basis_type`` combines the types of added nodes with the current basis type."""
+    basis_set = BasisSet(label='label').store()
+    assert basis_set.basis_type is None
+
+    basis_set.add_nodes(get_basis_data(element='Ar', entry_point='pao').store())
+    assert basis_set.basis_type == 'basis.pao'
+
+    basis_set.add_nodes([get_basis_data(element='He', entry_point='pao').store()])
+    assert basis_set.basis_type == 'basis.pao'
+
+    with pytest.raises(AssertionError, match=r'Basis set contains basis data nodes of various types.'):
+        basis_set.add_nodes(get_basis_data(element='Ne').store())
+
+    with pytest.raises(AssertionError, match=r'Basis set contains basis data nodes of various types.'):
+        basis_set.update_basis_type({PaoData, BasisData})
+
+    basis_set.update_basis_type()
+    assert basis_set.basis_type == 'basis.pao'